@@ -3,71 +3,88 @@
 
 import re
 import time
+import random
+import asyncio
 import argparse
+import signal
 import os
 import shutil
+import sqlite3
+import tempfile
+import hashlib
+import json
+import gzip
+import ipaddress
+from contextlib import contextmanager
 from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from typing import List
+import importlib.util
 import subprocess
 import sys
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 import threading
+import multiprocessing
 
 
-def install_and_import(package_name, pip_name=None):
-    """Installe et importe un package si nécessaire"""
-    if pip_name is None:
-        pip_name = package_name
-    
-    try:
-        return __import__(package_name)
-    except ImportError:
-        print(f"⚠ Installation de {package_name}...")
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", pip_name], 
-                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            print(f"✓ {package_name} installé avec succès")
-            return __import__(package_name)
-        except subprocess.CalledProcessError as e:
-            print(f"✗ Erreur lors de l'installation de {package_name}: {e}")
-            print("Essayez d'installer manuellement avec:")
-            print(f"pip install {pip_name}")
-            sys.exit(1)
+# Dépendances importées sans effet de bord : rien n'est installé ni contacté à l'import.
+# Les manques sont signalés par check_dependencies() au lancement (installation : --install-deps)
+try:
+    import requests
+except ImportError:
+    requests = None
+
+try:
+    from tqdm import tqdm
+except ImportError:
+    class tqdm:
+        """Barre de progression muette : le module reste utilisable (benchmark.py, import) sans tqdm"""
+
+        def __init__(self, iterable=None, *args, **kwargs):
+            self.iterable = iterable
+
+        def __iter__(self):
+            return iter(self.iterable)
+
+        def update(self, n=1):
+            pass
 
-def safe_import():
-    """Importe les modules requis avec installation automatique"""
-    print("🔍 Vérification des dépendances...")
-    requests = install_and_import('requests')
-    tqdm      = install_and_import('tqdm') 
+        def close(self):
+            pass
+
+# Dépendance optionnelle : client HTTP asynchrone pour le mode --async
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Dépendance optionnelle : notifications du système de fichiers (inotify...) pour --watch
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+
+# Paquets requis par tous les services : (module importé, spécification pip)
+CORE_REQUIREMENTS = [('tqdm', 'tqdm>=4.64.0')]
+
+def check_dependencies(service: str) -> List[str]:
+    """Retourne les spécifications pip des paquets manquants, sans rien importer ni installer"""
+    requirements = CORE_REQUIREMENTS + list(BACKENDS[service].requires if service in BACKENDS else [])
+    return [pip_name for module_name, pip_name in requirements if importlib.util.find_spec(module_name) is None]
+
+def install_dependencies(pip_names: List[str]) -> bool:
+    """Installe explicitement les paquets manquants (--install-deps)"""
+    print(f"⚠ Installation de {', '.join(pip_names)}...")
     try:
-        from googletrans import Translator
-        print("✓ googletrans déjà installé")
-    except ImportError:
-        print("⚠ Installation de googletrans...")
-        try:
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "googletrans==4.0.0rc1"],
-                                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            from googletrans import Translator
-            print("✓ googletrans installé avec succès")
-        except Exception as e:
-            print(f"✗ Erreur avec googletrans: {e}")
-            print("Essayez une version alternative:")
-            try:
-                subprocess.check_call([sys.executable, "-m", "pip", "install", "googletrans==3.1.0a0"],
-                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                from googletrans import Translator
-                print("✓ googletrans (version alternative) installé")
-            except Exception as e2:
-                print(f"✗ Impossible d'installer googletrans: {e2}")
-                print("Installation manuelle requise:")
-                print("pip install googletrans==4.0.0rc1")
-                sys.exit(1)
-    return requests, Translator
-
-# Importation avec installation auto
-requests, Translator = safe_import()
-
-from tqdm import tqdm
+        subprocess.check_call([sys.executable, "-m", "pip", "install", *pip_names],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"✗ Erreur lors de l'installation : {e}")
+        print(f"Installation manuelle requise : pip install {' '.join(repr(name) for name in pip_names)}")
+        return False
+    print("✓ Dépendances installées")
+    return True
 
 # Lock pour les affichages thread-safe
 print_lock = threading.Lock()
@@ -77,35 +94,1318 @@ def thread_safe_print(*args, **kwargs):
     with print_lock:
         print(*args, **kwargs)
 
-class RenpyAutoTranslator:
-    def __init__(self, service='google', libretranslate_url='http://localhost:5000', max_workers=3):
-        self.service = service
-        self.libretranslate_url = libretranslate_url
+class TranslationCache:
+    """Mémoire de traduction persistante (SQLite) indexée par (service, langue, texte masqué)"""
+
+    def __init__(self, db_path='translation_cache.sqlite', max_entries=200000, max_age_days=90):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self._lock = threading.Lock()
+        # Une seule connexion partagée entre les threads, protégée par le lock
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " service TEXT NOT NULL,"
+            " target_lang TEXT NOT NULL,"
+            " source TEXT NOT NULL,"
+            " translation TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_used REAL NOT NULL,"
+            " fuzzy_key TEXT,"
+            " PRIMARY KEY (service, target_lang, source))"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(translations)")}
+        if 'fuzzy_key' not in columns:
+            # Cache créé par une version précédente : ajoute et calcule la clé de similarité
+            self._conn.execute("ALTER TABLE translations ADD COLUMN fuzzy_key TEXT")
+            rows = self._conn.execute("SELECT rowid, source FROM translations").fetchall()
+            self._conn.executemany("UPDATE translations SET fuzzy_key=? WHERE rowid=?",
+                                   [(fuzzy_key(source), rowid) for rowid, source in rows])
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON translations(last_used)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_fuzzy_key ON translations(service, target_lang, fuzzy_key)")
+        self._conn.commit()
+        self.prune()
+
+    def get(self, service: str, target_lang: str, text: str, count: bool = True):
+        """Retourne la traduction en cache ou None ; count=False consulte sans toucher aux statistiques"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translation FROM translations WHERE service=? AND target_lang=? AND source=?",
+                (service, target_lang, text)
+            ).fetchone()
+            if not count:
+                return row[0] if row is not None else None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE translations SET last_used=? WHERE service=? AND target_lang=? AND source=?",
+                (time.time(), service, target_lang, text)
+            )
+            return row[0]
+
+    def set(self, service: str, target_lang: str, text: str, translation: str):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (service, target_lang, text, translation, now, now, fuzzy_key(text))
+            )
+            self.stores += 1
+            # Commit groupé pour limiter les écritures disque
+            if self.stores % 100 == 0:
+                self._conn.commit()
+
+    def similar(self, service: str, target_lang: str, key: str, limit=5):
+        """Retourne [(texte, traduction)] des entrées de même clé de similarité, les plus récentes d'abord"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT source, translation FROM translations WHERE service=? AND target_lang=? AND fuzzy_key=?"
+                " ORDER BY last_used DESC LIMIT ?", (service, target_lang, key, limit)
+            ).fetchall()
+
+    def prune(self):
+        """Éviction par âge (dernière utilisation) puis par taille (les moins récemment utilisées)"""
+        with self._lock:
+            removed = 0
+            if self.max_age_days:
+                cutoff = time.time() - self.max_age_days * 86400
+                removed += self._conn.execute(
+                    "DELETE FROM translations WHERE last_used < ?", (cutoff,)
+                ).rowcount
+            if self.max_entries:
+                count = self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+                excess = count - self.max_entries
+                if excess > 0:
+                    removed += self._conn.execute(
+                        "DELETE FROM translations WHERE rowid IN "
+                        "(SELECT rowid FROM translations ORDER BY last_used ASC LIMIT ?)", (excess,)
+                    ).rowcount
+            self._conn.commit()
+            return removed
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def report(self):
+        total = self.hits + self.misses
+        ratio = (self.hits / total * 100) if total else 0.0
+        print(f"🧠 Cache de traduction: {self.hits} hits, {self.misses} misses "
+              f"({ratio:.1f}% de réussite), {self.stores} nouvelles entrées")
+
+    def close(self):
+        self.prune()
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+# Classificateur de lignes Ren'Py : motifs compilés une seule fois au chargement du module
+IGNORE_PATTERNS = [
+    r'^\s*#',                       # Commentaires
+    r'^\s*$',                       # Lignes vides
+    r'^\s*old\s+"',                 # Ligne old
+    r'^\s*new\s+"old:.*"',          # new "old:xxxx"
+    r'^\s*new\s*".*_\d+(\.\d+)*_?\d*"',  # new "xxx_1234" etc
+    r'.*\.(webp|webm|mp4|mov|png|jpg|jpeg|gif|bmp|mp3|ogg|wav|mp4|mkv|avi|mov|flac|svg|ico|ttf|otf|eot|woff2?).*"',    # (optionnel) pour d'autres formats
+]
+# Une seule alternation au lieu de six re.match par ligne
+IGNORE_LINE_RE = re.compile('|'.join(f'(?:{p})' for p in IGNORE_PATTERNS))
+QUOTED_RE = re.compile(r'"((?:[^"\\]|\\.)*)"')
+TAG_RE = re.compile(r'(\{[^}]*\}|\\n|\\t|\\r|\[[^\]]*\])')
+TAG_MARKER_RE = re.compile(r'\s*RENPYTAG(\d+)END\s*', flags=re.IGNORECASE)
+WHITESPACE_RE = re.compile(r'\s+')
+SPACE_BEFORE_BRACKET_RE = re.compile(r'(?<!\s)(?<=\w)\[')
+SPACE_AFTER_BRACKET_RE = re.compile(r'\](?=\w)')
+SPACE_BEFORE_BRACE_RE = re.compile(r'(?<!\s)(\{[^}]+\})')
+SPACE_AFTER_BRACE_RE = re.compile(r'(\{[^}]+\})(?!\s)')
+DIALOGUE_LINE_RE = re.compile(r'^(\s*\w*\s*)"(.*)"(\s*)$')
+UNESCAPED_APOSTROPHE_RE = re.compile(r"(?<!\\)'")
+# Marqueurs numérotés séparant les textes regroupés dans une seule requête
+# Code de langue accepté par l'API locale (--serve) : "fr", "zh-CN", "pt_BR"...
+LANG_CODE_RE = re.compile(r'^[A-Za-z]{2,3}(?:[-_][A-Za-z0-9]{2,8})*$')
+PACK_MARKER_RE = re.compile(r'\s*RENPYSEG(\d+)END\s*', flags=re.IGNORECASE)
+# Statut HTTP dans les erreurs googletrans : 'Unexpected status code "429" from [...]'
+GOOGLE_STATUS_RE = re.compile(r'status code "?(\d{3})')
+PACK_OVERHEAD = 16
+
+def classify_line(line: str) -> bool:
+    """Indique si une ligne peut contenir du texte à traduire"""
+    # Sans guillemet, aucun texte à extraire : inutile d'évaluer les motifs
+    if '"' not in line:
+        return False
+    return IGNORE_LINE_RE.match(line) is None
+
+def pack_texts(texts: List[str]) -> str:
+    """Regroupe des textes courts en une seule chaîne, un texte par ligne précédé de son marqueur"""
+    return "\n".join(f"RENPYSEG{i}END {text}" for i, text in enumerate(texts))
+
+def unpack_texts(packed: str, count: int) -> List[str]:
+    """Découpe une traduction regroupée ; ValueError si les marqueurs ne sont pas tous retrouvés dans l'ordre"""
+    parts = PACK_MARKER_RE.split(packed)
+    if parts[0].strip():
+        raise ValueError("regroupement invalide : texte avant le premier marqueur")
+    if len(parts) != 2 * count + 1:
+        raise ValueError(f"regroupement invalide : {(len(parts) - 1) // 2} marqueurs pour {count} textes")
+    if parts[1::2] != [str(i) for i in range(count)]:
+        raise ValueError("regroupement invalide : marqueurs dans le désordre")
+    texts = [text.strip() for text in parts[2::2]]
+    if not all(texts):
+        raise ValueError("regroupement invalide : texte vide")
+    return texts
+
+# Ponctuation et espaces de bord : deux textes qui ne diffèrent que par là partagent une traduction
+AFFIX_RE = re.compile(r'^([\s¡¿(\-–—]*)(.*?)([\s!?.,;:…~)\-–—]*)$', flags=re.DOTALL)
+
+def split_affixes(text: str):
+    """Découpe un texte en (ponctuation de début, cœur, ponctuation de fin)"""
+    return AFFIX_RE.match(text).groups()
+
+def affix_class(affix: str) -> frozenset:
+    # "!!" et "!", "..." et "…" sont de même nature ; "!" et "?" non
+    return frozenset(affix.replace('…', '.').replace('—', '-').replace('–', '-')) - {' ', '\t', '\n'}
+
+def fuzzy_key(text: str):
+    """Clé de similarité : le cœur du texte aux espaces normalisés, None s'il n'y a rien à comparer"""
+    core = WHITESPACE_RE.sub(' ', split_affixes(text)[1]).strip()
+    return core or None
+
+def adapt_translation(source: str, translation: str, text: str):
+    """
+    Réutilise la traduction d'un texte quasi identique : même cœur, ponctuation de bord de même
+    nature. Retourne la traduction adaptée à la ponctuation de text, ou None si ce n'est pas sûr.
+    """
+    source_prefix, source_core, source_suffix = split_affixes(source)
+    prefix, core, suffix = split_affixes(text)
+    translated_prefix, translated_core, translated_suffix = split_affixes(translation)
+    if not translated_core or fuzzy_key(source_core) != fuzzy_key(core):
+        return None
+    if affix_class(prefix) != affix_class(source_prefix) or affix_class(suffix) != affix_class(source_suffix):
+        return None
+    # La traduction doit porter la même ponctuation de bord que sa source pour pouvoir la remplacer
+    if (affix_class(translated_prefix) != affix_class(source_prefix)
+            or affix_class(translated_suffix) != affix_class(source_suffix)):
+        return None
+    # Les espaces entre cœur et ponctuation suivent l'usage de la langue cible (ex. "Bonjour !")
+    gap_before = translated_prefix[len(translated_prefix.rstrip()):] if prefix.strip() else ''
+    gap_after = translated_suffix[:len(translated_suffix) - len(translated_suffix.lstrip())] if suffix.strip() else ''
+    return f"{prefix.strip()}{gap_before}{translated_core}{gap_after}{suffix.strip()}"
+
+def similarity_group(text: str):
+    """Regroupe les variantes d'un même texte qui peuvent partager une traduction"""
+    prefix, _, suffix = split_affixes(text)
+    key = fuzzy_key(text)
+    return (key, affix_class(prefix), affix_class(suffix)) if key is not None else None
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()[:16]
+
+def file_digest(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class TranslationState:
+    """
+    État de traduction par projet (JSON) : pour chaque fichier, les hashs des textes réellement
+    traduits par le traducteur (différents de leur source). Un texte du fichier dont le hash est
+    connu est déjà traduit ; une entrée nouvelle ou modifiée par une mise à jour du jeu est
+    régénérée par Ren'Py avec son texte source, inconnu de l'état, et part donc au service.
+    """
+
+    def __init__(self, state_path='translation_state.json'):
+        self.state_path = state_path
+        self.skipped = 0
+        self._lock = threading.Lock()
+        self.files = {}
+        if os.path.exists(state_path):
+            try:
+                with open(state_path, 'r', encoding='utf-8') as f:
+                    # Version 1 : {hash écrit: hash source} ; seules les clés servent
+                    self.files = {path: set(hashes) for path, hashes in json.load(f).get("files", {}).items()}
+            except (OSError, ValueError, AttributeError, TypeError) as e:
+                print(f"⚠ État de traduction illisible ({e}), tout sera retraduit")
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def is_translated(self, path: str, text: str, count: bool = True) -> bool:
+        with self._lock:
+            entries = self.files.get(self._key(path))
+            if entries is not None and text_hash(text) in entries:
+                if count:
+                    self.skipped += 1
+                return True
+            return False
+
+    @staticmethod
+    def make_entries(written_texts: List[str], source_texts: List[str]) -> List[str]:
+        """
+        Hashs à enregistrer pour une ligne une fois le fichier écrit : seuls les textes qui diffèrent
+        de leur source, un texte laissé tel quel (échec, texte inchangé par le service) n'est pas traduit
+        """
+        if len(written_texts) == len(source_texts):
+            changed = [text for text, source in zip(written_texts, source_texts) if text != source]
+        else:
+            changed = [text for text in written_texts if text not in source_texts]
+        return [text_hash(text) for text in changed]
+
+    def record(self, path: str, entries):
+        with self._lock:
+            file_entries = self.files.setdefault(self._key(path), set())
+            for entry in entries:
+                if isinstance(entry, list):
+                    # Journal de reprise écrit par une version précédente : [hashs écrits, hash source]
+                    file_entries.update(entry[0])
+                else:
+                    file_entries.add(entry)
+
+    def save(self):
+        with self._lock:
+            tmp_path = f"{self.state_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": 2, "files": {path: sorted(hashes) for path, hashes in self.files.items()}},
+                          f, separators=(',', ':'))
+            os.replace(tmp_path, self.state_path)
+
+    def report(self):
+        print(f"⏭ Traduction incrémentale: {self.skipped} textes déjà traduits ignorés")
+
+    def __getstate__(self):
+        # Copie en lecture pour les processus CPU : le verrou n'est pas transmissible
+        data = self.__dict__.copy()
+        del data['_lock']
+        return data
+
+    def __setstate__(self, data):
+        self.__dict__.update(data)
+        self._lock = threading.Lock()
+
+class CheckpointJournal:
+    """
+    Journal de reprise en ajout seul (JSON Lines) : traductions obtenues et fichiers terminés.
+    Les écritures sont mises en tampon et vidées par lots ; --resume rejoue le journal pour ne
+    plus solliciter le réseau pour ces textes et sauter les fichiers déjà écrits.
+    """
+
+    def __init__(self, journal_path='translation_journal.jsonl', resume=False, flush_every=200,
+                 flush_interval=5.0):
+        self.journal_path = journal_path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.translations = {}
+        self.finished_files = {}
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        if resume:
+            self._replay()
+        elif os.path.exists(journal_path) and os.path.getsize(journal_path) > 0:
+            # Jamais d'écrasement silencieux : le journal d'une exécution interrompue reste reprenable
+            raise FileExistsError(f"Un journal de reprise existe déjà ({journal_path}) : relancez avec --resume "
+                                  f"pour reprendre, ou supprimez-le pour repartir de zéro")
+        self._file = open(journal_path, 'a', encoding='utf-8')
+
+    def _replay(self):
+        if not os.path.exists(self.journal_path):
+            print(f"ℹ Aucun journal de reprise trouvé ({self.journal_path})")
+            return
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Dernière ligne tronquée par un arrêt brutal
+                    continue
+                if record[0] == 't':
+                    _, service, target_lang, text, translated = record
+                    self.translations[(service, target_lang, text)] = translated
+                elif record[0] == 'f':
+                    _, path, state_entries = record
+                    self.finished_files[path] = state_entries
+        print(f"♻ Reprise: {len(self.translations)} traductions et "
+              f"{len(self.finished_files)} fichiers terminés relus depuis {self.journal_path}")
+
+    @staticmethod
+    def _key(path: str) -> str:
+        return os.path.normcase(os.path.abspath(path))
+
+    def get(self, service: str, target_lang: str, text: str):
+        return self.translations.get((service, target_lang, text))
+
+    def is_finished(self, path: str) -> bool:
+        return self._key(path) in self.finished_files
+
+    def add_translation(self, service: str, target_lang: str, text: str, translated: str):
+        self._append(['t', service, target_lang, text, translated])
+
+    def mark_finished(self, path: str, state_entries=()):
+        # Les entrées d'état incrémental accompagnent le fichier pour rester cohérentes à la reprise
+        self._append(['f', self._key(path), list(state_entries)], force_flush=True)
+
+    def _append(self, record, force_flush=False):
+        line = json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n'
+        with self._lock:
+            self._buffer.append(line)
+            if (force_flush or len(self._buffer) >= self.flush_every
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self._buffer and not self._file.closed:
+            self._file.writelines(self._buffer)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._buffer.clear()
+        self._last_flush = time.monotonic()
+
+    def close(self, completed=False):
+        """Vide le tampon ; le journal est supprimé si la traduction est allée jusqu'au bout ou s'il est vide"""
+        with self._lock:
+            self._flush_locked()
+            self._file.close()
+        if os.path.exists(self.journal_path) and (completed or os.path.getsize(self.journal_path) == 0):
+            os.remove(self.journal_path)
+
+class BackupStore:
+    """
+    Sauvegardes dédupliquées par contenu : chaque fichier est stocké une seule fois sous son
+    hash SHA-256 (objects/), chaque dossier sauvegardé produit un manifeste (manifests/<id>.json).
+    Un fichier inchangé (même taille, même date de modification) ne coûte ni copie ni relecture.
+    Les manifestes d'une même exécution (plusieurs langues) partagent un identifiant "run" ;
+    la rétention (keep) s'applique dossier par dossier.
+    """
+
+    def __init__(self, root='backup_translations', keep=10, compress=False):
+        self.root = root
+        self.keep = keep
+        self.compress = compress
+        self.objects_path = os.path.join(root, 'objects')
+        self.manifests_path = os.path.join(root, 'manifests')
+
+    def _object_path(self, digest: str, compressed: bool) -> str:
+        return os.path.join(self.objects_path, digest[:2], digest + ('.gz' if compressed else ''))
+
+    def _has_object(self, digest: str) -> bool:
+        return (os.path.exists(self._object_path(digest, False))
+                or os.path.exists(self._object_path(digest, True)))
+
+    def _store_object(self, file_path: str, digest: str):
+        object_path = self._object_path(digest, self.compress)
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        tmp_path = f"{object_path}.tmp"
+        with open(file_path, 'rb') as src:
+            if self.compress:
+                with gzip.open(tmp_path, 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+            else:
+                with open(tmp_path, 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+        os.replace(tmp_path, object_path)
+
+    def _read_object(self, digest: str) -> bytes:
+        compressed_path = self._object_path(digest, True)
+        if os.path.exists(compressed_path):
+            with gzip.open(compressed_path, 'rb') as f:
+                return f.read()
+        with open(self._object_path(digest, False), 'rb') as f:
+            return f.read()
+
+    def list_backups(self) -> List[dict]:
+        """Manifestes du plus ancien au plus récent"""
+        if not os.path.isdir(self.manifests_path):
+            return []
+        manifests = []
+        for name in os.listdir(self.manifests_path):
+            if name.endswith('.json'):
+                with open(os.path.join(self.manifests_path, name), 'r', encoding='utf-8') as f:
+                    manifests.append(json.load(f))
+        return sorted(manifests, key=lambda manifest: manifest["created"])
+
+    def load_manifest(self, backup_id: str) -> dict:
+        if backup_id == 'latest':
+            manifests = self.list_backups()
+            if not manifests:
+                raise FileNotFoundError(f"Aucune sauvegarde dans {self.root}")
+            return manifests[-1]
+        with open(os.path.join(self.manifests_path, f"{backup_id}.json"), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def load_run(self, backup_id: str) -> List[dict]:
+        """Manifestes à restaurer : "latest" désigne tous les dossiers de la dernière exécution"""
+        if backup_id != 'latest':
+            return [self.load_manifest(backup_id)]
+        last = self.load_manifest('latest')
+        run_id = last.get("run", last["id"])
+        return [manifest for manifest in self.list_backups() if manifest.get("run", manifest["id"]) == run_id]
+
+    def backup(self, source_path: str, run_id: str = None) -> dict:
+        """Sauvegarde un dossier ; retourne le manifeste créé (run_id : exécution à laquelle il appartient)"""
+        source_path = os.path.abspath(source_path)
+        # Index (taille, date) de la sauvegarde précédente du même dossier : évite de relire les fichiers inchangés
+        previous = {}
+        for manifest in self.list_backups():
+            if manifest["source"] == source_path:
+                previous = manifest["files"]
+
+        files = {}
+        stored = 0
+        stored_bytes = 0
+        for root, dirs, names in os.walk(source_path):
+            for name in names:
+                file_path = os.path.join(root, name)
+                rel_path = os.path.relpath(file_path, source_path).replace(os.sep, '/')
+                stat = os.stat(file_path)
+                known = previous.get(rel_path)
+                if (known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns
+                        and self._has_object(known["sha256"])):
+                    digest = known["sha256"]
+                else:
+                    digest = file_digest(file_path)
+                    if not self._has_object(digest):
+                        self._store_object(file_path, digest)
+                        stored += 1
+                        stored_bytes += stat.st_size
+                files[rel_path] = {"sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+        os.makedirs(self.manifests_path, exist_ok=True)
+        backup_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        suffix = 1
+        while os.path.exists(os.path.join(self.manifests_path, f"{backup_id}.json")):
+            suffix += 1
+            backup_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{suffix}"
+        manifest = {"id": backup_id, "run": run_id or backup_id, "created": time.time(), "source": source_path,
+                    "files": files}
+        manifest_path = os.path.join(self.manifests_path, f"{backup_id}.json")
+        with open(f"{manifest_path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=1)
+        os.replace(f"{manifest_path}.tmp", manifest_path)
+
+        manifest["stored"] = stored
+        manifest["stored_bytes"] = stored_bytes
+        self.prune()
+        return manifest
+
+    def prune(self) -> int:
+        """Applique la politique de rétention (par dossier) puis supprime les objets plus référencés"""
+        by_source = {}
+        for manifest in self.list_backups():
+            by_source.setdefault(manifest["source"], []).append(manifest)
+        manifests = []
+        removed = 0
+        for source_manifests in by_source.values():
+            if self.keep and len(source_manifests) > self.keep:
+                for manifest in source_manifests[:-self.keep]:
+                    os.remove(os.path.join(self.manifests_path, f"{manifest['id']}.json"))
+                    removed += 1
+                source_manifests = source_manifests[-self.keep:]
+            manifests.extend(source_manifests)
+        referenced = {entry["sha256"] for manifest in manifests for entry in manifest["files"].values()}
+        if os.path.isdir(self.objects_path):
+            for root, dirs, names in os.walk(self.objects_path):
+                for name in names:
+                    digest = name[:-3] if name.endswith('.gz') else name
+                    if digest not in referenced:
+                        os.remove(os.path.join(root, name))
+        return removed
+
+    def restore(self, backup_id: str = 'latest', target_path: str = None):
+        """
+        Ramène un dossier à l'état d'une sauvegarde : fichiers réécrits (écriture atomique) et
+        fichiers apparus depuis supprimés. Retourne (nb de fichiers restaurés, fichiers supprimés).
+        """
+        manifest = self.load_manifest(backup_id)
+        target_path = target_path or manifest["source"]
+        for rel_path, entry in manifest["files"].items():
+            file_path = os.path.join(target_path, *rel_path.split('/'))
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(f"{file_path}.restore.tmp", 'wb') as f:
+                f.write(self._read_object(entry["sha256"]))
+            os.replace(f"{file_path}.restore.tmp", file_path)
+
+        removed = []
+        for root, dirs, names in os.walk(target_path):
+            for name in names:
+                file_path = os.path.join(root, name)
+                rel_path = os.path.relpath(file_path, target_path).replace(os.sep, '/')
+                if rel_path not in manifest["files"]:
+                    os.remove(file_path)
+                    removed.append(rel_path)
+        return len(manifest["files"]), sorted(removed)
+
+class RunMetrics:
+    """
+    Instrumentation d'une exécution : temps cumulés par étape (analyse, E/S fichiers, réseau,
+    attente du limiteur, backoff), compteurs (requêtes, caractères envoyés, cache, erreurs par
+    type) et textes traduits par worker. Exportable en JSON ou au format texte Prometheus.
+    """
+
+    PREFIX = "renpy_translator"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.stage_seconds = {}
+        self.counters = {}
+        self.errors = {}
+        self.workers = {}
+        self._server = None
+
+    @contextmanager
+    def timer(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(stage, time.perf_counter() - start)
+
+    def add_time(self, stage: str, seconds: float):
+        with self._lock:
+            self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+
+    def incr(self, name: str, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def error(self, error: Exception):
+        status = getattr(error, 'status', None)
+        kind = f"http_{status}" if status else type(error).__name__
+        with self._lock:
+            self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def worker_done(self, strings: int, seconds: float, worker: str = None):
+        """Comptabilise un lot traduit par le worker courant (thread par défaut)"""
+        worker = worker or threading.current_thread().name
+        with self._lock:
+            done, busy = self.workers.get(worker, (0, 0.0))
+            self.workers[worker] = (done + strings, busy + seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "started": datetime.fromtimestamp(self.started).isoformat(timespec='seconds'),
+                "elapsed_seconds": round(time.time() - self.started, 3),
+                "stage_seconds": {stage: round(seconds, 4) for stage, seconds in self.stage_seconds.items()},
+                "counters": dict(self.counters),
+                "errors": dict(self.errors),
+                "workers": {worker: {"strings": done, "busy_seconds": round(busy, 4),
+                                     "strings_per_second": round(done / busy, 2) if busy else 0.0}
+                            for worker, (done, busy) in self.workers.items()},
+            }
+
+    def write_json(self, path: str):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def prometheus_text(self) -> str:
+        data = self.snapshot()
+        p = self.PREFIX
+        lines = [f"# TYPE {p}_elapsed_seconds gauge", f"{p}_elapsed_seconds {data['elapsed_seconds']}",
+                 f"# TYPE {p}_stage_seconds_total counter"]
+        lines += [f'{p}_stage_seconds_total{{stage="{stage}"}} {seconds}'
+                  for stage, seconds in sorted(data["stage_seconds"].items())]
+        for name, value in sorted(data["counters"].items()):
+            lines += [f"# TYPE {p}_{name}_total counter", f"{p}_{name}_total {value}"]
+        lines.append(f"# TYPE {p}_errors_total counter")
+        lines += [f'{p}_errors_total{{type="{kind}"}} {count}' for kind, count in sorted(data["errors"].items())]
+        lines.append(f"# TYPE {p}_worker_strings_total counter")
+        lines += [f'{p}_worker_strings_total{{worker="{worker}"}} {stats["strings"]}'
+                  for worker, stats in sorted(data["workers"].items())]
+        lines.append(f"# TYPE {p}_worker_strings_per_second gauge")
+        lines += [f'{p}_worker_strings_per_second{{worker="{worker}"}} {stats["strings_per_second"]}'
+                  for worker, stats in sorted(data["workers"].items())]
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int, host: str = '127.0.0.1'):
+        """Expose /metrics au format Prometheus dans un thread d'arrière-plan"""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus_text().encode('utf-8')
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        print(f"📊 Métriques Prometheus : http://{host}:{self._server.server_address[1]}/metrics")
+
+    def close(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def report(self):
+        stages = ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in sorted(self.stage_seconds.items()))
+        print(f"📊 Temps par étape : {stages or 'aucun'}")
+
+class FileWatcher:
+    """
+    Surveille les .rpy d'un dossier et signale ceux dont le contenu a changé, une fois l'activité
+    retombée (anti-rebond). Utilise les notifications du système (watchdog/inotify) si disponibles,
+    sinon un balayage périodique : la date et la taille filtrent, le hash SHA-256 confirme.
+    """
+
+    def __init__(self, root: str, interval=1.0, debounce=2.0):
+        self.root = root
+        self.interval = interval
+        self.debounce = debounce
+        # Index {chemin: (mtime_ns, taille, sha256)} du dernier contenu connu
+        self.index = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._observer = None
+        for file_path in self._scan():
+            self.refresh(file_path)
+
+    def _scan(self):
+        for root, dirs, files in os.walk(self.root):
+            for file in files:
+                if file.endswith('.rpy'):
+                    yield os.path.join(root, file)
+
+    def refresh(self, file_path: str):
+        """Mémorise le contenu actuel d'un fichier (après notre propre réécriture par exemple)"""
+        try:
+            stat = os.stat(file_path)
+            self.index[file_path] = (stat.st_mtime_ns, stat.st_size, file_digest(file_path))
+        except OSError:
+            self.index.pop(file_path, None)
+
+    def _changed(self, file_path: str) -> bool:
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            self.index.pop(file_path, None)
+            return False
+        known = self.index.get(file_path)
+        if known is not None and known[:2] == (stat.st_mtime_ns, stat.st_size):
+            return False
+        digest = file_digest(file_path)
+        self.index[file_path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return known is None or known[2] != digest
+
+    def notify(self, file_path: str):
+        """Enregistre un événement : le fichier sera examiné une fois l'anti-rebond écoulé"""
+        if file_path.endswith('.rpy'):
+            with self._lock:
+                self._pending[file_path] = time.monotonic()
+
+    def start(self):
+        if Observer is None:
+            print(f"👀 Surveillance par balayage toutes les {self.interval:g}s (pip install watchdog pour inotify)")
+            return
+        watcher = self
+
+        class Handler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                if not event.is_directory:
+                    watcher.notify(getattr(event, 'dest_path', None) or event.src_path)
+
+        self._observer = Observer()
+        self._observer.schedule(Handler(), self.root, recursive=True)
+        self._observer.start()
+        print("👀 Surveillance par notifications du système de fichiers")
+
+    def stop(self):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def wait_changes(self) -> List[str]:
+        """Bloque jusqu'à ce que des fichiers modifiés soient stables ; retourne leurs chemins triés"""
+        while True:
+            if self._observer is None:
+                for file_path in self._scan():
+                    if file_path not in self._pending and self._changed(file_path):
+                        self.notify(file_path)
+            now = time.monotonic()
+            with self._lock:
+                ready = [file_path for file_path, seen in self._pending.items() if now - seen >= self.debounce]
+                for file_path in ready:
+                    del self._pending[file_path]
+            if self._observer is not None:
+                ready = [file_path for file_path in ready if self._changed(file_path)]
+            elif ready:
+                # Un fichier encore en cours d'écriture repousse l'anti-rebond
+                still_moving = [file_path for file_path in ready if self._changed(file_path)]
+                for file_path in still_moving:
+                    self.notify(file_path)
+                ready = [file_path for file_path in ready if file_path not in still_moving
+                         and os.path.exists(file_path)]
+            if ready:
+                return sorted(ready)
+            time.sleep(self.interval)
+
+class TranslationServiceError(Exception):
+    """Erreur renvoyée par un service de traduction (HTTP 429/5xx, réponse invalide, réseau...)"""
+
+    def __init__(self, message, status=None, retryable=True, retry_after=None):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+    @property
+    def throttled(self):
+        return self.status == 429 or (self.status is not None and self.status >= 500)
+
+class ServiceUnavailableError(TranslationServiceError):
+    """Trop de lots consécutifs en échec : le service est considéré comme hors service"""
+
+    def __init__(self, message):
+        super().__init__(message, retryable=False)
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket partagé par service, auto-ajusté (AIMD) :
+    - chaque succès rapide augmente le débit de façon additive
+    - un 429/5xx divise le débit par deux et suspend les envois pendant Retry-After
+    - une latence au-delà de target_latency réduit légèrement le débit
+    """
+
+    def __init__(self, rate=5.0, burst=None, min_rate=0.2, max_rate=100.0, target_latency=5.0,
+                 backoff_base=0.5, backoff_max=60.0):
+        self.rate = rate
+        self.burst = burst or max(1.0, rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.target_latency = target_latency
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.last_decrease = 0.0
+        self.throttle_count = 0
+        self.retry_count = 0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Consomme un jeton et retourne le délai d'attente nécessaire avant l'envoi"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Le solde peut devenir négatif : les appelants suivants font la queue
+            self.tokens -= 1
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(delay, self.blocked_until - now)
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def on_success(self, latency: float):
+        with self._lock:
+            if latency > self.target_latency:
+                self.rate = max(self.min_rate, self.rate * 0.9)
+            else:
+                self.rate = min(self.max_rate, self.rate + 0.1 + self.rate * 0.02)
+            self.burst = max(1.0, self.rate)
+
+    def on_throttle(self, retry_after: float = None):
+        with self._lock:
+            self.throttle_count += 1
+            now = time.monotonic()
+            # Une rafale de 429 simultanés ne compte que pour une seule réduction
+            if now - self.last_decrease >= 1.0:
+                self.rate = max(self.min_rate, self.rate / 2)
+                self.burst = max(1.0, self.rate)
+                self.last_decrease = now
+            self.tokens = min(self.tokens, 0.0)
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def backoff_delay(self, attempt: int, retry_after: float = None) -> float:
+        """Backoff exponentiel avec jitter, au moins égal au Retry-After demandé par le serveur"""
+        with self._lock:
+            self.retry_count += 1
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        delay = random.uniform(delay / 2, delay)
+        return max(delay, retry_after or 0.0)
+
+    def report(self, name: str):
+        print(f"⏱ Limiteur {name}: {self.rate:.1f} req/s, {self.throttle_count} ralentissement(s) "
+              f"(429/5xx), {self.retry_count} nouvelle(s) tentative(s)")
+
+# Un limiteur par service (et par URL pour LibreTranslate), partagé par tous les threads
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+def get_rate_limiter(key: str, **kwargs) -> AdaptiveRateLimiter:
+    with _rate_limiters_lock:
+        if key not in _rate_limiters:
+            _rate_limiters[key] = AdaptiveRateLimiter(**kwargs)
+        return _rate_limiters[key]
+
+class CircuitBreaker:
+    """
+    Coupe-circuit : après max_failures lots consécutifs en échec (nouvelles tentatives épuisées),
+    plus aucune requête n'est envoyée et le traitement s'arrête. Un service banni ou hors ligne
+    fait ainsi échouer l'exécution en quelques minutes au lieu de la laisser ramper au débit minimal.
+    """
+
+    def __init__(self, max_failures=5):
+        self.max_failures = max_failures
+        self.failures = 0
+        self.last_error = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return bool(self.max_failures) and self.failures >= self.max_failures
+
+    def check(self):
+        """Lève ServiceUnavailableError si le circuit est ouvert"""
+        if self.is_open:
+            raise ServiceUnavailableError(
+                f"{self.failures} lots consécutifs en échec, dernière erreur : {self.last_error}")
+
+    def success(self):
+        with self._lock:
+            if not self.is_open:
+                self.failures = 0
+
+    def reset(self):
+        with self._lock:
+            self.failures = 0
+
+    def failure(self, error: Exception):
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+
+def parse_retry_after(value) -> float:
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+class TranslationBackend:
+    """
+    Interface des services de traduction. Un backend traduit des lots de textes masqués et
+    annonce ses limites : taille de lot, budget de caractères, débit et concurrence par défaut.
+    Les erreurs sont signalées par TranslationServiceError.
+    """
+
+    name = None
+    max_batch_size = 50
+    max_chars = 5000
+    default_rate = 5.0          # Débit initial du limiteur (requêtes/s)
+    default_concurrency = 4     # Requêtes simultanées par défaut en mode --async
+    batch_requests = True       # Un lot = une requête HTTP (sinon une requête par texte)
+    pack_strings = False        # Regroupe un lot en une seule chaîne à marqueurs (--pack)
+    requires = []               # Paquets requis : (module importé, spécification pip)
+
+    @property
+    def limiter_key(self) -> str:
+        return self.name
+
+    def translate_batch(self, texts: List[str], target_lang: str) -> List[str]:
+        raise NotImplementedError
+
+    def translate(self, text: str, target_lang: str) -> str:
+        return self.translate_batch([text], target_lang)[0]
+
+    def health_check(self, target_lang: str = 'fr') -> bool:
+        try:
+            return bool(self.translate("Hello", target_lang))
+        except TranslationServiceError:
+            return False
+
+    def close(self):
+        pass
+
+BACKENDS = {}
+
+def register_backend(cls):
+    """Décorateur d'enregistrement d'un backend sous son nom de service"""
+    BACKENDS[cls.name] = cls
+    return cls
+
+def create_backend(name: str, **options) -> TranslationBackend:
+    if name not in BACKENDS:
+        raise ValueError(f"Service de traduction non supporté: {name}")
+    return BACKENDS[name](**options)
+
+@register_backend
+class GoogleBackend(TranslationBackend):
+    name = 'google'
+    max_chars = 5000            # Limite de caractères par requête de Google Translate
+    default_rate = 5.0
+    default_concurrency = 4
+    batch_requests = False      # googletrans envoie une requête par élément de liste
+    pack_strings = True
+    requires = [('googletrans', 'googletrans==4.0.0rc1')]
+
+    def __init__(self, **options):
+        # Client créé à la première traduction : construire le traducteur ne coûte aucun appel réseau
         self.google_translator = None
-        self.max_workers = max_workers
+        self._init_lock = threading.Lock()
+
+    # Erreurs de transport httpx (noms selon la version) : connexion coupée, délai dépassé...
+    TRANSIENT_ERRORS = {'TransportError', 'NetworkError', 'TimeoutException', 'ProtocolError', 'ProxyError'}
+
+    def _client(self):
+        with self._init_lock:
+            if self.google_translator is None:
+                try:
+                    from googletrans import Translator
+                    # Sans raise_exception, un 429/5xx renvoie le texte source comme "traduction"
+                    self.google_translator = Translator(raise_exception=True)
+                except Exception as e:
+                    raise TranslationServiceError(f"Google Translate indisponible : {e}", retryable=False) from e
+            return self.google_translator
+
+    def translate_batch(self, texts, target_lang):
+        google_translator = self._client()
+        try:
+            results = google_translator.translate(texts, dest=target_lang)
+        except Exception as e:
+            raise self._service_error(e) from e
+        translations = [result.text for result in results]
+        # Réponse identique à la requête : Google n'a rien traduit (blocage silencieux), on réessaie.
+        # Un texte isolé peut légitimement rester identique (nom propre, "OK") : seuls les lots sont vérifiés
+        if translations == list(texts) and (len(texts) > 1 or PACK_MARKER_RE.search(texts[0])):
+            raise TranslationServiceError("Réponse Google Translate identique au texte source")
+        return translations
+
+    def _service_error(self, error: Exception) -> TranslationServiceError:
+        """Classe une erreur googletrans, qui n'a pas de type dédié : statut HTTP lu dans le message"""
+        match = GOOGLE_STATUS_RE.search(str(error))
+        status = int(match.group(1)) if match else None
+        if status is not None:
+            retryable = status == 429 or status >= 500
+        else:
+            # Coupure réseau ou délai dépassé : transitoire ; toute autre erreur (réponse illisible...) ne l'est pas
+            retryable = (isinstance(error, OSError)
+                         or any(cls.__name__ in self.TRANSIENT_ERRORS for cls in type(error).__mro__))
+        return TranslationServiceError(f"Erreur Google Translate : {error}", status=status, retryable=retryable)
+
+@register_backend
+class LibreTranslateBackend(TranslationBackend):
+    name = 'libretranslate'
+    max_batch_size = 100
+    max_chars = 10000
+    default_rate = 20.0
+    default_concurrency = 16
+    requires = [('requests', 'requests>=2.25.1')]
+
+    def __init__(self, libretranslate_url='http://localhost:5000', **options):
+        self.url = libretranslate_url
+        # Session créée à la première requête : --plan n'a besoin ni de requests ni du réseau
+        self._http = None
+        self._init_lock = threading.Lock()
+
+    @property
+    def http(self):
+        """Session HTTP partagée : réutilise les connexions keep-alive entre les requêtes"""
+        with self._init_lock:
+            if self._http is None:
+                if requests is None:
+                    raise ImportError("requests est requis pour LibreTranslate (pip install requests)")
+                self._http = requests.Session()
+            return self._http
+
+    @property
+    def limiter_key(self) -> str:
+        return f"{self.name}:{self.url}"
 
-        if service == 'google':
+    def _payload(self, q, target_lang):
+        return {
+            "q": q,
+            "source": "auto",
+            "target": target_lang,
+            "format": "text"
+        }
+
+    def translate_batch(self, texts, target_lang):
+        headers = {"Content-Type": "application/json"}
+        try:
+            response = self.http.post(f"{self.url}/translate", headers=headers,
+                                      json=self._payload(texts, target_lang), timeout=60)
+        except requests.RequestException as e:
+            raise TranslationServiceError(f"Erreur réseau LibreTranslate : {e}") from e
+        if response.status_code >= 400:
+            raise TranslationServiceError(
+                f"Erreur LibreTranslate : HTTP {response.status_code}", status=response.status_code,
+                retryable=response.status_code == 429 or response.status_code >= 500,
+                retry_after=parse_retry_after(response.headers.get("Retry-After")))
+        try:
+            return response.json()["translatedText"]
+        except (ValueError, KeyError) as e:
+            raise TranslationServiceError(f"Réponse LibreTranslate invalide : {e}") from e
+
+    async def translate_batch_async(self, session, texts, target_lang):
+        """Variante aiohttp utilisée par AsyncTranslationEngine"""
+        try:
+            async with session.post(f"{self.url}/translate", json=self._payload(texts, target_lang)) as response:
+                if response.status >= 400:
+                    raise TranslationServiceError(
+                        f"HTTP {response.status}", status=response.status,
+                        retryable=response.status == 429 or response.status >= 500,
+                        retry_after=parse_retry_after(response.headers.get("Retry-After")))
+                payload = await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise TranslationServiceError(f"Erreur réseau LibreTranslate : {e}") from e
+        return payload["translatedText"]
+
+    def health_check(self, target_lang: str = 'fr') -> bool:
+        try:
+            response = self.http.get(f"{self.url}/languages", timeout=10)
+        except requests.RequestException:
+            return False
+        return response.status_code == 200
+
+    def close(self):
+        if self._http is not None:
+            self._http.close()
+
+# Modèles Argos chargés une seule fois par processus de travail
+_argos_translations = {}
+
+def _argos_translate_chunk(job):
+    """Traduit un morceau de lot dans un processus de travail (doit rester au niveau du module)"""
+    source_lang, target_lang, texts = job
+    translation = _argos_translations.get((source_lang, target_lang))
+    if translation is None:
+        import argostranslate.translate
+        languages = {language.code: language for language in argostranslate.translate.get_installed_languages()}
+        if source_lang not in languages or target_lang not in languages:
+            raise ValueError(f"Modèle Argos {source_lang}->{target_lang} non installé")
+        translation = languages[source_lang].get_translation(languages[target_lang])
+        if translation is None:
+            raise ValueError(f"Modèle Argos {source_lang}->{target_lang} non installé")
+        _argos_translations[(source_lang, target_lang)] = translation
+    return [translation.translate(text) for text in texts]
+
+@register_backend
+class ArgosBackend(TranslationBackend):
+    """
+    Traduction locale hors ligne (Argos Translate / CTranslate2 sur CPU), sans aucun appel HTTP.
+    Chaque lot est réparti entre plusieurs processus : le débit suit le nombre de cœurs.
+    """
+
+    name = 'argos'
+    max_batch_size = 512
+    max_chars = 50000
+    default_rate = 1000.0
+    default_concurrency = 1
+    requires = [('argostranslate', 'argostranslate')]
+
+    def __init__(self, processes=None, source_lang='en', **options):
+        self.processes = processes or os.cpu_count() or 1
+        self.source_lang = source_lang
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._pool_lock:
+            if self._pool is None:
+                if importlib.util.find_spec('argostranslate') is None:
+                    raise TranslationServiceError(
+                        "argostranslate n'est pas installé (pip install argostranslate)", retryable=False)
+                self._pool = multiprocessing.get_context('spawn').Pool(self.processes)
+            return self._pool
+
+    def translate_batch(self, texts, target_lang):
+        pool = self._get_pool()
+        size = -(-len(texts) // self.processes)
+        jobs = [(self.source_lang, target_lang, texts[i:i + size]) for i in range(0, len(texts), size)]
+        try:
+            chunks = pool.map(_argos_translate_chunk, jobs)
+        except Exception as e:
+            raise TranslationServiceError(f"Erreur Argos Translate : {e}", retryable=False) from e
+        return [translated for chunk in chunks for translated in chunk]
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool.join()
+                self._pool = None
+
+class AsyncTranslationEngine:
+    """
+    Moteur de traduction asyncio : chaque lot (un texte si --batch-size 1) est une requête
+    indépendante, le nombre de requêtes simultanées est borné par un sémaphore.
+    Les backends qui proposent translate_batch_async passent par aiohttp (pool de connexions)
+    si disponible ; les autres, synchrones, sont exécutés dans un pool de threads dimensionné
+    sur la concurrence.
+    """
+
+    def __init__(self, translator, concurrency=16):
+        self.translator = translator
+        self.concurrency = max(1, concurrency)
+
+    def run(self, batches: List[List[str]], target_lang: str, progress=None) -> dict:
+        return asyncio.run(self._run_all(batches, target_lang, progress))
+
+    async def _run_all(self, batches, target_lang, progress):
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=self.concurrency)
+        loop.set_default_executor(executor)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        session = None
+        if aiohttp is not None and hasattr(self.translator.backend, 'translate_batch_async'):
+            connector = aiohttp.TCPConnector(limit=self.concurrency)
+            session = aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=60))
+        results = {}
+        try:
+            tasks = [asyncio.create_task(self._run_batch(semaphore, session, batch, target_lang))
+                     for batch in batches]
+            for task in asyncio.as_completed(tasks):
+                results.update(await task)
+                if progress is not None:
+                    progress.update(1)
+        finally:
+            if session is not None:
+                await session.close()
+            executor.shutdown(wait=False)
+        return results
+
+    async def _run_batch(self, semaphore, session, batch, target_lang):
+        async with semaphore:
+            start = time.perf_counter()
             try:
-                self.google_translator = Translator()
-                self.google_translator.translate("test", dest='fr')
-                print("✓ Google Translate connecté")
+                payload = self.translator._pack(batch)
+                if session is not None:
+                    translations = await self._post_with_retry(session, payload, target_lang)
+                else:
+                    translations = await asyncio.to_thread(
+                        self.translator._request_with_retry, self.translator.backend.translate_batch,
+                        payload, target_lang)
+            except ServiceUnavailableError:
+                raise
             except Exception as e:
-                print(f"⚠ Problème avec Google Translate: {e}")
-                print("Passage en mode LibreTranslate recommandé")
-        self.google_char_limit = 5000
-
-    def create_backup(self, source_path: str) -> str:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = f"backup_translations_{timestamp}"
-        if os.path.exists(source_path):
-            print(f"💾 Création de la sauvegarde: {backup_path}")
-            shutil.copytree(source_path, backup_path)
-            print(f"✓ Sauvegarde créée: {backup_path}")
-        else:
+                results = self.translator._batch_failed(batch, e)
+            else:
+                self.translator.breaker.success()
+                try:
+                    results = self.translator._collect_batch(
+                        batch, self.translator._unpack(batch, translations), target_lang)
+                except ValueError as e:
+                    results = await asyncio.to_thread(self.translator._fallback_batch, batch, target_lang, e)
+            if self.translator.metrics is not None:
+                self.translator.metrics.worker_done(len(results), time.perf_counter() - start, worker="asyncio")
+            return results
+
+    async def _post_with_retry(self, session, batch, target_lang):
+        limiter = self.translator.rate_limiter
+        metrics = self.translator.metrics
+        for attempt in range(self.translator.max_retries + 1):
+            self.translator.breaker.check()
+            start = time.perf_counter()
+            await limiter.acquire_async()
+            waited = time.perf_counter() - start
+            start += waited
+            try:
+                translations = await self.translator.backend.translate_batch_async(session, batch, target_lang)
+            except TranslationServiceError as e:
+                self.translator._observe_request(batch, waited, time.perf_counter() - start, e)
+                if not e.retryable or attempt == self.translator.max_retries:
+                    raise
+                if e.throttled:
+                    limiter.on_throttle(e.retry_after)
+                delay = limiter.backoff_delay(attempt, e.retry_after)
+                if metrics is not None:
+                    metrics.add_time("backoff", delay)
+                await asyncio.sleep(delay)
+                continue
+            latency = time.perf_counter() - start
+            self.translator._observe_request(batch, waited, latency)
+            limiter.on_success(latency)
+            return translations
+
+class RenpyAutoTranslator:
+    def __init__(self, service='google', libretranslate_url='http://localhost:5000', max_workers=3,
+                 cache: TranslationCache = None, batch_size=50, concurrency=None, rate_limit=None,
+                 max_retries=5, state: TranslationState = None, journal: CheckpointJournal = None,
+                 backup_store: BackupStore = None, backend: TranslationBackend = None, cpu_processes=0,
+                 metrics: RunMetrics = None, pack_strings=None, fuzzy=True, max_failed_batches=5):
+        self.service = service
+        self.backend = backend or create_backend(service, libretranslate_url=libretranslate_url)
+        self.max_workers = max_workers
+        # Processus dédiés à l'extraction et à la réécriture (0 = dans le processus principal)
+        self.cpu_processes = cpu_processes
+        self.cache = cache
+        # Taille de lot et budget de caractères bornés par les limites annoncées par le backend
+        self.batch_size = max(1, min(batch_size, self.backend.max_batch_size))
+        self.char_limit = self.backend.max_chars
+        # Regroupement des textes courts d'un lot en une seule requête (par défaut selon le backend)
+        self.pack_strings = self.backend.pack_strings if pack_strings is None else pack_strings
+        # Réutilisation des traductions de textes quasi identiques (ponctuation de bord près)
+        self.fuzzy = fuzzy
+        self.state = state
+        self.journal = journal
+        self.metrics = metrics
+        self.backup_store = backup_store or BackupStore()
+        if journal is not None and state is not None:
+            # Rejoue l'état incrémental des fichiers terminés avant l'interruption
+            for path, entries in journal.finished_files.items():
+                state.record(path, entries)
+        # Limiteur de débit partagé par service, ajusté selon les 429/5xx et la latence
+        self.max_retries = max_retries
+        rate = rate_limit or self.backend.default_rate
+        self.rate_limiter = get_rate_limiter(self.backend.limiter_key, rate=rate, max_rate=max(100.0, rate))
+        # Arrêt après max_failed_batches lots consécutifs en échec (0 = jamais)
+        self.breaker = CircuitBreaker(max_failed_batches)
+        # Moteur asyncio optionnel (--async) : concurrence au niveau des lots de textes
+        self.async_engine = AsyncTranslationEngine(self, concurrency) if concurrency else None
+        # Segments déjà extraits par ligne, partagés entre les arbres de langue (plusieurs --lang)
+        self.line_memo = None
+
+    def __getstate__(self):
+        # Seul l'état incrémental est transmis aux processus CPU : ni réseau, ni cache, ni journal
+        return {'state': self.state}
+
+    def __setstate__(self, data):
+        self.__dict__.update(data)
+        self.metrics = None
+        self.line_memo = None
+
+    def create_backup(self, source_path: str, run_id: str = None) -> str:
+        if not os.path.exists(source_path):
             print(f"ℹ Aucune traduction existante à sauvegarder")
-        return backup_path
+            return None
+        print(f"💾 Création de la sauvegarde dans {self.backup_store.root}...")
+        manifest = self.backup_store.backup(source_path, run_id=run_id)
+        print(f"✓ Sauvegarde créée: {manifest['id']} ({len(manifest['files'])} fichiers, "
+              f"{manifest['stored']} nouveaux, {manifest['stored_bytes'] / 1024:.0f} Ko copiés)")
+        return manifest['id']
     
-    def find_game_folder(self, start_path: str = ".") -> str:
+    @staticmethod
+    def find_game_folder(start_path: str = ".") -> str:
         game_path = os.path.join(start_path, "game")
         if os.path.exists(game_path):
             return game_path
@@ -128,51 +1428,312 @@ class RenpyAutoTranslator:
     def translate_text(self, text: str, target_lang: str) -> str:
         if not text or not text.strip():
             return text
-        if self.service == 'google':
-            return self._translate_google(text, target_lang)
-        elif self.service == 'libretranslate':
-            return self._translate_libretranslate(text, target_lang)
+        cached = self._recall(text, target_lang)
+        if cached is not None:
+            return cached
+        translated = self._request_with_retry(self.backend.translate, text, target_lang)
+        self._remember(text, translated, target_lang)
+        return translated
+
+    def _recall(self, text: str, target_lang: str):
+        """Cherche une traduction déjà obtenue (journal de reprise puis cache)"""
+        if self.journal is not None:
+            translated = self.journal.get(self.service, target_lang, text)
+            if translated is not None:
+                if self.metrics is not None:
+                    self.metrics.incr("journal_hits")
+                return translated
+        translated = None
+        if self.cache is not None:
+            translated = self.cache.get(self.service, target_lang, text)
+        if self.metrics is not None:
+            self.metrics.incr("cache_hits" if translated is not None else "cache_misses")
+        return translated
+
+    def _recall_similar(self, text: str, target_lang: str):
+        """Adapte la traduction en cache d'une variante du texte (ex. "Hello!" pour "Hello!!")"""
+        if self.cache is None:
+            return None
+        key = fuzzy_key(text)
+        if key is None:
+            return None
+        for source, translation in self.cache.similar(self.service, target_lang, key):
+            adapted = adapt_translation(source, translation, text)
+            if adapted is not None:
+                if self.metrics is not None:
+                    self.metrics.incr("fuzzy_hits")
+                return adapted
+        return None
+
+    def _remember(self, text: str, translated: str, target_lang: str):
+        if not translated or translated == text:
+            return
+        if self.cache is not None:
+            self.cache.set(self.service, target_lang, text, translated)
+        if self.journal is not None:
+            self.journal.add_translation(self.service, target_lang, text, translated)
+
+    def pending_files(self, rpy_files: List[str]) -> List[str]:
+        """Retire les fichiers déjà terminés selon le journal de reprise"""
+        if self.journal is None:
+            return rpy_files
+        pending = [rpy_file for rpy_file in rpy_files if not self.journal.is_finished(rpy_file)]
+        if len(pending) < len(rpy_files):
+            print(f"♻ {len(rpy_files) - len(pending)} fichiers déjà terminés ignorés")
+        return pending
+
+    def close(self, completed=False):
+        """Libère les ressources et affiche les statistiques du cache"""
+        self.backend.close()
+        if self.metrics is not None:
+            self.metrics.report()
+        if self.journal is not None:
+            self.journal.close(completed=completed)
+        self.rate_limiter.report(self.service)
+        if self.state is not None:
+            self.state.save()
+            self.state.report()
+        if self.cache is not None:
+            self.cache.report()
+            self.cache.close()
+            self.cache = None
+
+    def _request_with_retry(self, func, *args):
+        """Appelle un backend via le limiteur de débit, avec backoff exponentiel sur les erreurs transitoires"""
+        for attempt in range(self.max_retries + 1):
+            self.breaker.check()
+            start = time.perf_counter()
+            self.rate_limiter.acquire()
+            waited = time.perf_counter() - start
+            start += waited
+            try:
+                result = func(*args)
+            except TranslationServiceError as e:
+                self._observe_request(args[0], waited, time.perf_counter() - start, e)
+                if not e.retryable or attempt == self.max_retries:
+                    raise
+                if e.throttled:
+                    self.rate_limiter.on_throttle(e.retry_after)
+                delay = self.rate_limiter.backoff_delay(attempt, e.retry_after)
+                if self.metrics is not None:
+                    self.metrics.add_time("backoff", delay)
+                time.sleep(delay)
+                continue
+            latency = time.perf_counter() - start
+            self._observe_request(args[0], waited, latency)
+            self.rate_limiter.on_success(latency)
+            return result
+
+    def _observe_request(self, payload, waited: float, latency: float, error: Exception = None):
+        """Comptabilise une requête : attente du limiteur, temps réseau, caractères envoyés, erreur"""
+        if self.metrics is None:
+            return
+        texts = [payload] if isinstance(payload, str) else payload
+        self.metrics.add_time("rate_limit_wait", waited)
+        self.metrics.add_time("network", latency)
+        self.metrics.incr("requests")
+        self.metrics.incr("strings_sent", len(texts))
+        self.metrics.incr("characters_sent", sum(len(text) for text in texts))
+        if error is not None:
+            self.metrics.error(error)
+
+    def iter_batches(self, texts: List[str]):
+        """Découpe les textes en lots limités par batch_size et par le budget de caractères"""
+        batch = []
+        batch_chars = 0
+        # En mode regroupé, chaque texte coûte aussi son marqueur et son saut de ligne
+        overhead = PACK_OVERHEAD if self.pack_strings else 0
+        for text in texts:
+            size = len(text) + overhead
+            if batch and (len(batch) >= self.batch_size or batch_chars + size > self.char_limit):
+                yield batch
+                batch = []
+                batch_chars = 0
+            batch.append(text)
+            batch_chars += size
+        if batch:
+            yield batch
+
+    def translate_batch(self, texts: List[str], target_lang: str, desc: str = None, position: int = 0,
+                        max_workers: int = 1) -> dict:
+        """Traduit une liste de textes masqués par lots ; retourne {texte source: traduction}"""
+        results = {}
+        pending = []
+        for text in dict.fromkeys(texts):
+            if not text or not text.strip():
+                results[text] = text
+                continue
+            cached = self._recall(text, target_lang)
+            if cached is None and self.fuzzy:
+                cached = self._recall_similar(text, target_lang)
+                if cached is not None:
+                    self._remember(text, cached, target_lang)
+            if cached is not None:
+                results[text] = cached
+            else:
+                pending.append(text)
+
+        # Variantes d'un même texte : une seule est envoyée, les autres sont déduites de sa traduction
+        variants = {}
+        if self.fuzzy:
+            leaders = {}
+            for text in pending:
+                group = similarity_group(text)
+                if group is None:
+                    continue
+                if group in leaders:
+                    variants[text] = leaders[group]
+                else:
+                    leaders[group] = text
+            if variants:
+                pending = [text for text in pending if text not in variants]
+
+        results.update(self._translate_pending(pending, target_lang, desc, position, max_workers))
+
+        retry = []
+        for text, leader in variants.items():
+            adapted = adapt_translation(leader, results[leader], text) if leader in results else None
+            if adapted is None:
+                retry.append(text)
+            else:
+                results[text] = adapted
+                self._remember(text, adapted, target_lang)
+                if self.metrics is not None:
+                    self.metrics.incr("fuzzy_hits")
+        if retry:
+            results.update(self._translate_pending(retry, target_lang, desc, position, max_workers))
+        return results
+
+    def _translate_pending(self, pending: List[str], target_lang: str, desc: str = None, position: int = 0,
+                           max_workers: int = 1) -> dict:
+        results = {}
+        batches = list(self.iter_batches(pending))
+        progress = tqdm(total=len(batches), desc=desc, position=position, leave=False, disable=desc is None)
+        if self.async_engine is not None and len(batches) > 1:
+            results.update(self.async_engine.run(batches, target_lang, progress))
+        elif max_workers > 1 and len(batches) > 1:
+            # Les lots sont indépendants : on les répartit entre plusieurs threads
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                try:
+                    for future in as_completed([executor.submit(self._translate_one_batch, batch, target_lang)
+                                                for batch in batches]):
+                        results.update(future.result())
+                        progress.update(1)
+                except BaseException:
+                    # Ctrl-C ou service indisponible : les lots en file d'attente ne sont pas envoyés
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
         else:
-            raise ValueError(f"Service de traduction non supporté: {self.service}")
+            for batch in batches:
+                results.update(self._translate_one_batch(batch, target_lang))
+                progress.update(1)
+        progress.close()
+        return results
 
-    def _translate_google(self, text, target_lang):
+    def _translate_one_batch(self, batch: List[str], target_lang: str) -> dict:
+        start = time.perf_counter()
         try:
-            result = self.google_translator.translate(text, dest=target_lang)
-            return result.text
+            translations = self._request_with_retry(self.backend.translate_batch, self._pack(batch), target_lang)
+        except ServiceUnavailableError:
+            raise
         except Exception as e:
-            thread_safe_print(f"❌ Erreur Google Translate : {e}")
-            return text
+            results = self._batch_failed(batch, e)
+        else:
+            self.breaker.success()
+            try:
+                results = self._collect_batch(batch, self._unpack(batch, translations), target_lang)
+            except ValueError as e:
+                results = self._fallback_batch(batch, target_lang, e)
+        if self.metrics is not None:
+            self.metrics.worker_done(len(results), time.perf_counter() - start)
+        return results
 
-    def _translate_libretranslate(self, text, target_lang):
-        try:
-            headers = {"Content-Type": "application/json"}
-            data = {
-                "q": text,
-                "source": "auto",
-                "target": target_lang,
-                "format": "text"
-            }
-            response = requests.post(f"{self.libretranslate_url}/translate", headers=headers, json=data)
-            return response.json()["translatedText"]
-        except Exception as e:
-            thread_safe_print(f"❌ Erreur LibreTranslate : {e}")
-            return text
+    def translate_strings(self, texts: List[str], target_lang: str) -> list:
+        """Traduit des textes Ren'Py isolés (contenu entre guillemets) ; None pour un texte non traduit"""
+        prepared = [self.prepare_text(text) for text in texts]
+        translations = self.translate_batch([item[0] for item in prepared if item is not None], target_lang,
+                                            max_workers=self.max_workers)
+        results = []
+        for text, item in zip(texts, prepared):
+            if item is None:
+                results.append(text)
+            elif item[0] in translations:
+                results.append(self.finalize_translation(translations[item[0]], item[1]))
+            else:
+                results.append(None)
+        return results
+
+    def _pack(self, batch: List[str]) -> List[str]:
+        """Charge utile d'un lot : une seule chaîne à marqueurs numérotés si le regroupement est actif"""
+        if self.pack_strings and len(batch) > 1:
+            return [pack_texts(batch)]
+        return batch
+
+    def _unpack(self, batch: List[str], translations: List[str]) -> List[str]:
+        # Un découpage invalide lève ValueError : le lot repasse alors texte par texte
+        if self.pack_strings and len(batch) > 1:
+            if len(translations) != 1:
+                raise ValueError(f"{len(translations)} réponses reçues pour un lot regroupé")
+            return unpack_texts(translations[0], len(batch))
+        return translations
+
+    def _collect_batch(self, batch: List[str], translations: List[str], target_lang: str) -> dict:
+        """Associe chaque texte du lot à sa traduction et alimente le cache"""
+        if len(translations) != len(batch):
+            raise ValueError(f"{len(translations)} traductions reçues pour {len(batch)} textes")
+        results = {}
+        for text, translated in zip(batch, translations):
+            results[text] = translated
+            self._remember(text, translated, target_lang)
+        return results
+
+    def _batch_failed(self, batch: List[str], error: Exception) -> dict:
+        """Lot abandonné après épuisement des nouvelles tentatives : aucun repli, le service est en cause"""
+        self.breaker.failure(error)
+        thread_safe_print(f"❌ Lot de {len(batch)} textes non traduit ({error})")
+        if self.metrics is not None:
+            self.metrics.incr("untranslated", len(batch))
+        self.breaker.check()
+        # Les textes absents du résultat sont comptés en erreur à la réécriture, jamais remplacés en silence
+        return {}
+
+    def _fallback_batch(self, batch: List[str], target_lang: str, error: Exception) -> dict:
+        # Repli texte par texte : une réponse mal découpée ne doit pas faire perdre toutes les lignes du lot
+        results = {}
+        if len(batch) > 1:
+            thread_safe_print(f"⚠ Lot de {len(batch)} textes mal découpé ({error}), repli unitaire")
+            for i, text in enumerate(batch):
+                try:
+                    results[text] = self.translate_text(text, target_lang)
+                except ServiceUnavailableError:
+                    raise
+                except Exception as e:
+                    # Le service lui-même refuse : inutile d'insister sur le reste du lot
+                    results.update(self._batch_failed(batch[i:], e))
+                    break
+                else:
+                    self.breaker.success()
+        else:
+            thread_safe_print(f"❌ Traduction impossible ({error}) : {batch[0][:60]}")
+            if self.metrics is not None:
+                self.metrics.incr("untranslated")
+        return results
 
     def format_text(self, text: str) -> str:
         # Ajoute des espaces autour des crochets et des balises Ren'Py
-        text = re.sub(r'(?<!\s)(?<=\w)\[', ' [', text)  # Espace avant [
-        text = re.sub(r'\](?=\w)', '] ', text)          # Espace après ]
+        if '[' in text or ']' in text:
+            text = SPACE_BEFORE_BRACKET_RE.sub(' [', text)  # Espace avant [
+            text = SPACE_AFTER_BRACKET_RE.sub('] ', text)   # Espace après ]
 
         # Ajoute des espaces autour des accolades {balise}
-        text = re.sub(r'(?<!\s)(\{[^}]+\})', r' \1', text)  # Espace avant {xxx}
-        text = re.sub(r'(\{[^}]+\})(?!\s)', r'\1 ', text)   # Espace après {xxx}
+        if '{' in text:
+            text = SPACE_BEFORE_BRACE_RE.sub(r' \1', text)  # Espace avant {xxx}
+            text = SPACE_AFTER_BRACE_RE.sub(r'\1 ', text)   # Espace après {xxx}
 
         return text
 
     def preserve_renpy_tags(self, text: str):
         """Préserve les balises Ren'Py et retours à la ligne avec numérotation séquentielle"""
-        # Pattern plus complet pour capturer toutes les balises Ren'Py
-        pattern = re.compile(r'(\{[^}]*\}|\\n|\\t|\\r|\[[^\]]*\])')
         tags = []
         
         def replacer(match):
@@ -181,7 +1742,7 @@ class RenpyAutoTranslator:
             # Utilise des marqueurs uniques avec espaces pour éviter les collisions
             return f' RENPYTAG{len(tags)-1}END '
         
-        replaced = pattern.sub(replacer, text)
+        replaced = TAG_RE.sub(replacer, text)
         return replaced, tags
 
     def restore_renpy_tags(self, translated: str, original_tags: List[str]):
@@ -189,9 +1750,6 @@ class RenpyAutoTranslator:
         if not original_tags:
             return translated
 
-        # Pattern insensible à la casse, avec espaces tolérés
-        pattern_tag = re.compile(r'\s*RENPYTAG(\d+)END\s*', flags=re.IGNORECASE)
-
         def restore(match):
             try:
                 idx = int(match.group(1))
@@ -204,131 +1762,321 @@ class RenpyAutoTranslator:
                 thread_safe_print(f"⚠ Erreur de parsing d'index: {match.group(1)}")
                 return ''
 
-        restored = pattern_tag.sub(restore, translated)
-
-        # Nettoyage final : supprime les balises orphelines restantes (même mal formatées)
-        orphan_pattern = re.compile(r'\s*RENPYTAG\d+END\s*', flags=re.IGNORECASE)
-        restored = orphan_pattern.sub('', restored)
-
-        return restored
+        # Motif insensible à la casse, avec espaces tolérés ; chaque marqueur est soit
+        # restauré, soit supprimé s'il est orphelin
+        return TAG_MARKER_RE.sub(restore, translated)
 
     def fix_quotes_universal(self, lines):
+        """Applique fix_quotes_line à une liste de lignes"""
+        return [self.fix_quotes_line(line) for line in lines]
+
+    def fix_quotes_line(self, line: str) -> str:
         """
         Convertit automatiquement les dialogues 'problématiques' en format compatible Ren'Py :
         - Convertit "Le mot \"prison\"." --> 'Le mot "prison".'
         - Échappe les apostrophes internes : 'l\'école'
         - Garde les balises {w}, {p}, etc. intactes
         """
-        def replace_unescaped_quotes(s):
-            s = re.sub(r'(?<!\\)\'', r"\\'", s)
-            s = s.replace('\\"', '"')
-            return s
-
-        fixed = []
-        pattern = re.compile(r'^(\s*\w*\s*)"(.*)"(\s*)$')
-        for line in lines:
-            match = pattern.match(line.rstrip('\n'))
-            if match:
-                prefix, content, suffix = match.groups()
-                needs_fix = '\\"' in content or "'" in content
-                if needs_fix:
-                    safe_content = replace_unescaped_quotes(content)
-                    fixed_line = f"{prefix}'{safe_content}'{suffix}\n"
-                    fixed.append(fixed_line)
-                else:
-                    fixed.append(line)
+        match = DIALOGUE_LINE_RE.match(line.rstrip('\n'))
+        if match:
+            prefix, content, suffix = match.groups()
+            needs_fix = '\\"' in content or "'" in content
+            if needs_fix:
+                safe_content = UNESCAPED_APOSTROPHE_RE.sub(r"\\'", content)
+                safe_content = safe_content.replace('\\"', '"')
+                return f"{prefix}'{safe_content}'{suffix}\n"
+        return line
+
+    def prepare_text(self, original_text: str):
+        """Formate et masque un texte ; retourne (texte masqué, balises) ou None s'il n'y a rien à traduire"""
+        # Formate le texte avant la traduction
+        formatted_text = self.format_text(original_text)
+
+        # Préserve les balises Ren'Py
+        clean_text, preserved_tags = self.preserve_renpy_tags(formatted_text)
+
+        # Vérifie si il y a du texte à traduire après suppression des balises
+        text_to_check = TAG_MARKER_RE.sub('', clean_text).strip() if preserved_tags else clean_text.strip()
+        if not text_to_check:
+            return None
+        return clean_text, preserved_tags
+
+    def finalize_translation(self, translated_clean: str, preserved_tags: List[str]) -> str:
+        """Restaure les balises et nettoie une traduction pour réinjection dans le .rpy"""
+        # Restaure les balises
+        translated_text = self.restore_renpy_tags(translated_clean, preserved_tags)
+
+        # Correction du texte traduit pour ajouter les espaces
+        translated_text = self.format_text(translated_text)
+
+        # Nettoyage final des espaces multiples
+        translated_text = WHITESPACE_RE.sub(' ', translated_text).strip()
+
+        # Échappe les guillemets internes pour Ren'Py
+        return translated_text.replace('"', '\\"')
+
+    def extract_line(self, line: str):
+        """Retourne les segments [(texte original, texte masqué, balises)] d'une ligne, None si ignorée"""
+        if not classify_line(line):
+            return None
+        if self.line_memo is None:
+            return self._extract_line(line)
+        segments = self.line_memo.get(line, False)
+        if segments is False:
+            segments = self.line_memo[line] = self._extract_line(line)
+        # Copie : les segments d'une ligne sont modifiés par l'état incrémental, propre à chaque fichier
+        return list(segments) if segments else None
+
+    def _extract_line(self, line: str):
+        segments = []
+        # Trouve tous les textes entre guillemets
+        for match in QUOTED_RE.finditer(line):
+            original_text = match.group(1)
+            prepared = self.prepare_text(original_text)
+            if prepared is None:
+                # Pas de texte à traduire, on garde l'original
+                segments.append((original_text, None, None))
             else:
-                fixed.append(line)
-        return fixed
+                segments.append((original_text, prepared[0], prepared[1]))
+        return segments or None
 
-    def translate_file(self, input_file: str, target_lang: str = 'fr'):
-        """Traduit un fichier RPY individuel"""
-        with open(input_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        
-        translated_lines = []
+    def rebuild_line(self, line: str, segments, translations: dict):
+        """Réinjecte les traductions dans la ligne ; retourne (ligne, nb traduits)"""
+        new_line = line
         translated_count = 0
-        error_count = 0
+        for original_text, clean_text, preserved_tags in segments:
+            if clean_text is None:
+                translated_text = original_text
+            else:
+                if clean_text not in translations:
+                    raise KeyError(f"texte non traduit : {clean_text[:60]}")
+                translated_text = self.finalize_translation(translations[clean_text], preserved_tags)
+                translated_count += 1
 
-        ignore_patterns = [
-            r'^\s*#',                       # Commentaires
-            r'^\s*$',                       # Lignes vides
-            r'^\s*old\s+"',                 # Ligne old
-            r'^\s*new\s+"old:.*"',          # new "old:xxxx"
-            r'^\s*new\s*".*_\d+(\.\d+)*_?\d*"',  # new "xxx_1234" etc
-            r'.*\.(webp|webm|mp4|mov|png|jpg|jpeg|gif|bmp|mp3|ogg|wav|mp4|mkv|avi|mov|flac|svg|ico|ttf|otf|eot|woff2?).*"',    # (optionnel) pour d'autres formats
-        ]
+            # Remplace dans la ligne
+            new_line = new_line.replace(f'"{original_text}"', f'"{translated_text}"', 1)
+        return new_line, translated_count
 
-        # Utilise une progress bar avec position différente pour chaque thread
-        thread_id = threading.get_ident()
-        desc = f"[Thread {thread_id % 1000}] {os.path.basename(input_file)}"
-        
-        for i, line in enumerate(tqdm(lines, desc=desc, position=thread_id % self.max_workers, leave=False)):
-            if any(re.match(p, line) for p in ignore_patterns):
-                translated_lines.append(line)
-                continue
+    def line_segments(self, input_file: str, line: str, count_skipped: bool = True):
+        segments = self.extract_line(line)
+        if segments and self.state is not None:
+            # Les textes déjà écrits par une exécution précédente sont conservés tels quels
+            for j, (original_text, clean_text, _) in enumerate(segments):
+                if clean_text is not None and self.state.is_translated(input_file, original_text,
+                                                                        count=count_skipped):
+                    segments[j] = (original_text, None, None)
+        return segments
 
-            # Trouve tous les textes entre guillemets
-            matches = list(re.finditer(r'"((?:[^"\\]|\\.)*)"', line))
-            if matches:
-                new_line = line
-                for match in matches:
-                    original_text = match.group(1)
-
-                    # Formate le texte avant la traduction
-                    formatted_text = self.format_text(original_text)
-                    
-                    # Préserve les balises Ren'Py
-                    clean_text, preserved_tags = self.preserve_renpy_tags(formatted_text)
-                    
-                    # Vérifie si il y a du texte à traduire après suppression des balises
-                    text_to_check = re.sub(r'\s*RENPYTAG\d+END\s*', '', clean_text).strip()
-                    
-                    if not text_to_check:
-                        # Pas de texte à traduire, on garde l'original
-                        translated_text = original_text
-                    else:
+    def iter_file_segments(self, input_file: str, count_skipped: bool = True):
+        """Parcourt un fichier RPY ligne par ligne ; produit (index, ligne, segments)"""
+        with open(input_file, 'r', encoding='utf-8') as f:
+            if self.metrics is not None:
+                yield from self._iter_timed_segments(input_file, f, count_skipped)
+                return
+            for i, line in enumerate(f):
+                yield i, line, self.line_segments(input_file, line, count_skipped)
+
+    def _iter_timed_segments(self, input_file: str, f, count_skipped: bool):
+        """Variante instrumentée : sépare le temps de lecture du temps d'analyse"""
+        read_seconds = 0.0
+        parse_seconds = 0.0
+        try:
+            start = time.perf_counter()
+            for i, line in enumerate(f):
+                read = time.perf_counter()
+                read_seconds += read - start
+                segments = self.line_segments(input_file, line, count_skipped)
+                parse_seconds += time.perf_counter() - read
+                yield i, line, segments
+                start = time.perf_counter()
+        finally:
+            self.metrics.add_time("io_read", read_seconds)
+            self.metrics.add_time("parse", parse_seconds)
+
+    def extract_file(self, input_file: str) -> List[str]:
+        """Retourne les textes masqués à traduire d'un fichier RPY, sans le garder en mémoire"""
+        return [clean_text for _, _, segments in self.iter_file_segments(input_file) if segments
+                for _, clean_text, _ in segments if clean_text is not None]
+
+    def write_file(self, input_file: str, translations: dict):
+        """Réécrit un fichier puis enregistre son état ; retourne (nb traduits, nb erreurs)"""
+        translated_count, error_count, state_entries = self.rewrite_file(input_file, translations)
+        self.record_file(input_file, state_entries, finished=error_count == 0)
+        return translated_count, error_count
+
+    def rewrite_file(self, input_file: str, translations: dict):
+        """
+        Réécrit un fichier en flux vers un fichier temporaire puis le remplace atomiquement :
+        un arrêt en cours d'écriture ne laisse jamais de .rpy à moitié écrit.
+        Retourne (nb traduits, nb erreurs, entrées d'état à enregistrer).
+        """
+        translated_count = 0
+        error_count = 0
+        state_entries = []
+        timed = self.metrics is not None
+        rewrite_seconds = 0.0
+        write_seconds = 0.0
+
+        directory = os.path.dirname(os.path.abspath(input_file))
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(input_file)}.", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as out:
+                for i, line, segments in self.iter_file_segments(input_file, count_skipped=False):
+                    if timed:
+                        start = time.perf_counter()
+                    count = 0
+                    if segments:
                         try:
-                            # Traduit le texte nettoyé
-                            translated_clean = self.translate_text(clean_text, target_lang)
-                            
-                            # Restaure les balises
-                            translated_text = self.restore_renpy_tags(translated_clean, preserved_tags)
-
-                            # Correction du texte traduit pour ajouter les espaces
-                            translated_text = self.format_text(translated_text)
-                            
-                            # Nettoyage final des espaces multiples
-                            translated_text = re.sub(r'\s+', ' ', translated_text).strip()
-                            
-                            # Échappe les guillemets internes pour Ren'Py
-                            translated_text = translated_text.replace('"', '\\"')
-                            
-                            translated_count += 1
-                            time.sleep(0.05)  # Réduit le délai pour LibreTranslate
-                            
+                            new_line, count = self.rebuild_line(line, segments, translations)
                         except Exception as e:
                             thread_safe_print(f"❌ Erreur ligne {i+1} dans {input_file}: {e}")
-                            translated_text = original_text
                             error_count += 1
-                    
-                    # Remplace dans la ligne
-                    new_line = new_line.replace(f'"{original_text}"', f'"{translated_text}"', 1)
-                
-                translated_lines.append(new_line)
-            else:
-                translated_lines.append(line)
+                            if timed:
+                                self.metrics.error(e)
+                            # Ligne laissée telle quelle : passée entre apostrophes, elle ne serait plus
+                            # reconnue comme texte à traduire par la prochaine exécution
+                            out.write(line)
+                            continue
+                        line = new_line
+                        translated_count += count
+                    # Correction des guillemets/apostrophes
+                    line = self.fix_quotes_line(line)
+                    if count and self.state is not None:
+                        written = [m.group(1) for m in QUOTED_RE.finditer(line)]
+                        state_entries.extend(self.state.make_entries(
+                            written, [original_text for original_text, _, _ in segments]))
+                    if timed:
+                        rebuilt = time.perf_counter()
+                        rewrite_seconds += rebuilt - start
+                        out.write(line)
+                        write_seconds += time.perf_counter() - rebuilt
+                    else:
+                        out.write(line)
+                start = time.perf_counter()
+            shutil.copymode(input_file, tmp_path)
+            os.replace(tmp_path, input_file)
+            write_seconds += time.perf_counter() - start
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        if timed:
+            self.metrics.add_time("rewrite", rewrite_seconds)
+            self.metrics.add_time("io_write", write_seconds)
+            self.metrics.incr("files_written")
+            self.metrics.incr("lines_translated", translated_count)
+        return translated_count, error_count, state_entries
+
+    def record_file(self, input_file: str, state_entries, finished: bool = True):
+        """Mémorise les textes tels qu'écrits pour ne pas les retraduire à la prochaine exécution"""
+        if self.state is not None and state_entries:
+            self.state.record(input_file, state_entries)
+        # Un fichier réécrit avec des lignes non traduites n'est pas terminé : --resume le reprendra
+        if self.journal is not None and finished:
+            self.journal.mark_finished(input_file, state_entries)
+
+    def translate_file(self, input_file: str, target_lang: str = 'fr'):
+        """Traduit un fichier RPY individuel"""
+        # Première passe : collecte des textes à traduire de tout le fichier
+        texts = self.extract_file(input_file)
 
-        # Correction des guillemets/apostrophes
-        translated_lines = self.fix_quotes_universal(translated_lines)
+        # Traduction groupée, avec une progress bar à position différente pour chaque thread
+        thread_id = threading.get_ident()
+        desc = f"[Thread {thread_id % 1000}] {os.path.basename(input_file)}"
+        translations = self.translate_batch(texts, target_lang, desc=desc, position=thread_id % self.max_workers)
 
-        # Écrit le fichier traduit
-        with open(input_file, 'w', encoding='utf-8') as f:
-            f.writelines(translated_lines)
+        # Seconde passe : réinjection des traductions à leur position d'origine
+        translated_count, error_count = self.write_file(input_file, translations)
 
         thread_safe_print(f"✓ {translated_count} lignes traduites – ⚠ {error_count} erreurs dans {os.path.basename(input_file)}")
         return translated_count, error_count
 
+    def translate_files_two_phase(self, rpy_files: List[str], target_lang: str = 'fr'):
+        """
+        Traduit un ensemble de fichiers en trois phases distinctes :
+        - extraction de tous les textes et de leurs occurrences (CPU)
+        - traduction unique de chaque texte distinct (réseau)
+        - réécriture de tous les fichiers à partir du dictionnaire de traductions
+        Avec cpu_processes, l'extraction et la réécriture sont réparties entre des processus
+        (un fichier par tâche) ; la traduction reste dans le processus principal.
+        """
+        rpy_files = self.pending_files(rpy_files)
+        if self.cpu_processes and len(rpy_files) > 1:
+            with ProcessPoolExecutor(max_workers=self.cpu_processes, mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_init_cpu_worker, initargs=(self,)) as executor:
+                return self._run_two_phase(rpy_files, target_lang, executor)
+        return self._run_two_phase(rpy_files, target_lang)
+
+    def _run_two_phase(self, rpy_files: List[str], target_lang: str, executor: ProcessPoolExecutor = None):
+        # Phase 1 : extraction
+        start = time.perf_counter()
+        occurrences = {}
+        file_texts = {}
+        if executor is None:
+            extracted = (self.extract_occurrences(rpy_file) for rpy_file in rpy_files)
+        else:
+            chunksize = max(1, len(rpy_files) // (self.cpu_processes * 4))
+            extracted = executor.map(_extract_file_job, rpy_files, chunksize=chunksize)
+        for rpy_file, (texts, skipped) in tqdm(zip(rpy_files, extracted), total=len(rpy_files),
+                                               desc="Extraction", leave=False):
+            if executor is not None and self.state is not None:
+                self.state.skipped += skipped
+            for clean_text, line_number in texts:
+                occurrences.setdefault(clean_text, []).append((rpy_file, line_number))
+            file_texts[rpy_file] = {clean_text for clean_text, _ in texts}
+        total_occurrences = sum(len(locations) for locations in occurrences.values())
+        self._phase_done("extract_phase", start)
+        print(f"🔎 Phase 1 – extraction : {total_occurrences} textes dont {len(occurrences)} uniques "
+              f"dans {len(rpy_files)} fichiers ({time.perf_counter() - start:.2f}s)")
+
+        # Phase 2 : traduction des textes uniques
+        start = time.perf_counter()
+        translations = self.translate_batch(list(occurrences), target_lang, desc="Traduction",
+                                            max_workers=self.max_workers)
+        self._phase_done("translate_phase", start)
+        print(f"🌐 Phase 2 – traduction : {len(translations)} textes uniques "
+              f"({time.perf_counter() - start:.2f}s)")
+
+        # Phase 3 : réécriture
+        start = time.perf_counter()
+        total_translated = 0
+        total_errors = 0
+        if executor is None:
+            rewrites = [(rpy_file, None) for rpy_file in rpy_files]
+        else:
+            # Chaque processus ne reçoit que les traductions des textes de son fichier
+            rewrites = [(rpy_file, executor.submit(_rewrite_file_job, rpy_file, {
+                text: translations[text] for text in file_texts[rpy_file] if text in translations}))
+                for rpy_file in rpy_files]
+        for rpy_file, future in rewrites:
+            try:
+                if future is None:
+                    translated, errors = self.write_file(rpy_file, translations)
+                else:
+                    translated, errors, state_entries = future.result()
+                    self.record_file(rpy_file, state_entries, finished=errors == 0)
+                total_translated += translated
+                total_errors += errors
+            except Exception as e:
+                thread_safe_print(f"❌ Erreur lors de l'écriture de {rpy_file}: {e}")
+                total_errors += 1
+        self._phase_done("write_phase", start)
+        print(f"💾 Phase 3 – écriture : {len(rpy_files)} fichiers ({time.perf_counter() - start:.2f}s)")
+        return total_translated, total_errors
+
+    def _phase_done(self, phase: str, start: float):
+        # Durée réelle de la phase : seule mesure disponible quand les fichiers sont traités hors processus
+        if self.metrics is not None:
+            self.metrics.add_time(phase, time.perf_counter() - start)
+
+    def extract_occurrences(self, input_file: str):
+        """Retourne ([(texte masqué, n° de ligne)], nb textes ignorés par l'état incrémental)"""
+        skipped = self.state.skipped if self.state is not None else 0
+        texts = [(clean_text, i + 1) for i, _, segments in self.iter_file_segments(input_file) if segments
+                 for _, clean_text, _ in segments if clean_text is not None]
+        return texts, (self.state.skipped - skipped if self.state is not None else 0)
+
     def generate_language_files(self, game_path: str):
         files_content = {
             "change_language_entrance.rpy": '''init python early hide:
@@ -408,66 +2156,530 @@ screen my_preferences():
                 f.write(content)
             print(f"✓ Fichier généré : {filepath}")
 
-    def translate_project_parallel(self, game_path: str = None, language: str = "french", target_lang: str = 'fr'):
-        """Traduit un projet complet avec traitement parallèle des fichiers"""
+    def translate_project_parallel(self, game_path: str = None, language: str = "french", target_lang: str = 'fr',
+                                   two_phase: bool = False):
+        """Traduit un projet complet avec traitement parallèle des fichiers ; retourne True s'il a été traité"""
         if game_path is None:
             game_path = self.find_game_folder()
         if not game_path:
             print("❌ Dossier 'game' introuvable! Assurez-vous d'être dans le répertoire du projet Ren'Py")
-            return
+            return False
 
         print(f"🎮 Projet Ren'Py détecté: {game_path}")
         translation_path = self.get_translation_path(game_path, language)
 
         if not os.path.exists(translation_path):
             print(f"❌ Dossier de traductions introuvable: {translation_path}")
-            return
+            return False
 
         backup_path = self.create_backup(translation_path)
         rpy_files = self.find_rpy_files(translation_path)
 
         if not rpy_files:
             print(f"❌ Aucun fichier .rpy trouvé dans {translation_path}")
-            return
+            return False
 
         print(f"📁 {len(rpy_files)} fichiers .rpy trouvés")
-        print(f"🚀 Lancement de la traduction parallèle avec {self.max_workers} threads...")
-        
+
+        if self.async_engine is not None:
+            # En mode asyncio, tout le projet passe par un seul dictionnaire de textes uniques
+            print(f"🚀 Lancement de la traduction asyncio ({self.async_engine.concurrency} requêtes simultanées)...")
+            total_translated, total_errors = self.translate_files_two_phase(rpy_files, target_lang)
+        elif two_phase or self.cpu_processes:
+            print(f"🚀 Lancement de la traduction en deux phases avec {self.max_workers} threads...")
+            total_translated, total_errors = self.translate_files_two_phase(rpy_files, target_lang)
+        else:
+            print(f"🚀 Lancement de la traduction parallèle avec {self.max_workers} threads...")
+            total_translated, total_errors = self.translate_files_parallel(rpy_files, target_lang)
+
+        self.generate_language_files(game_path)
+        print(f"\n🎉 Traduction terminée : {total_translated} lignes traduites, {total_errors} erreurs.")
+        if backup_path:
+            print(f"💾 Une sauvegarde est disponible : {backup_path} (restauration : --restore {backup_path})")
+        return True
+
+    def translate_files_parallel(self, rpy_files: List[str], target_lang: str = 'fr'):
+        """
+        Traduit des fichiers en parallèle via une file de travail partagée : chaque fichier est
+        découpé en tranches de lignes (un lot de textes par tranche), les plus gros fichiers
+        d'abord. Un thread libre prend la tranche suivante, quel que soit son fichier, et chaque
+        fichier est réécrit dès que toutes ses tranches sont traduites.
+        """
+        rpy_files = self.pending_files(rpy_files)
         total_translated = 0
         total_errors = 0
         completed_files = 0
 
-        # Traitement parallèle des fichiers
+        # Extraction : textes uniques de chaque fichier, dans l'ordre des lignes
+        file_texts = {}
+        for rpy_file in rpy_files:
+            try:
+                file_texts[rpy_file] = list(dict.fromkeys(self.extract_file(rpy_file)))
+            except Exception as e:
+                thread_safe_print(f"❌ Erreur lors du traitement de {rpy_file}: {e}")
+                total_errors += 1
+                completed_files += 1
+
+        chunks = [(rpy_file, texts[i:i + self.batch_size])
+                  for rpy_file, texts in sorted(file_texts.items(), key=lambda item: len(item[1]), reverse=True)
+                  for i in range(0, len(texts), self.batch_size)]
+        remaining = {rpy_file: 0 for rpy_file in file_texts}
+        for rpy_file, _ in chunks:
+            remaining[rpy_file] += 1
+        translations = {rpy_file: {} for rpy_file in file_texts}
+
+        def finish(rpy_file):
+            nonlocal total_translated, total_errors, completed_files
+            try:
+                translated, errors = self.write_file(rpy_file, translations.pop(rpy_file))
+                thread_safe_print(f"✓ {translated} lignes traduites – ⚠ {errors} erreurs dans {os.path.basename(rpy_file)}")
+                total_translated += translated
+                total_errors += errors
+            except Exception as e:
+                thread_safe_print(f"❌ Erreur lors du traitement de {rpy_file}: {e}")
+                total_errors += 1
+            completed_files += 1
+            thread_safe_print(f"📋 Progression: {completed_files}/{len(rpy_files)} fichiers traités")
+
+        # Fichiers sans texte à traduire : réécrits tout de suite (correction des guillemets)
+        for rpy_file in [rpy_file for rpy_file, count in remaining.items() if count == 0]:
+            finish(rpy_file)
+
+        # Une seule barre pour tout le projet, en textes : l'ETA reste juste quelle que soit la taille des fichiers
+        progress = tqdm(total=sum(len(texts) for _, texts in chunks), desc="Traduction", unit="txt")
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # Soumet tous les fichiers pour traduction
-            future_to_file = {
-                executor.submit(self.translate_file, rpy_file, target_lang): rpy_file 
-                for rpy_file in rpy_files
+            future_to_chunk = {
+                executor.submit(self.translate_batch, texts, target_lang): (rpy_file, texts)
+                for rpy_file, texts in chunks
             }
-            
-            # Collecte les résultats au fur et à mesure
-            for future in as_completed(future_to_file):
-                rpy_file = future_to_file[future]
+            try:
+                for future in as_completed(future_to_chunk):
+                    rpy_file, texts = future_to_chunk[future]
+                    try:
+                        translations[rpy_file].update(future.result())
+                    except ServiceUnavailableError:
+                        raise
+                    except Exception as e:
+                        # Les textes de la tranche restent non traduits et sont comptés en erreur à l'écriture
+                        thread_safe_print(f"❌ Erreur lors du traitement de {rpy_file}: {e}")
+                    progress.update(len(texts))
+                    remaining[rpy_file] -= 1
+                    if remaining[rpy_file] == 0:
+                        finish(rpy_file)
+            except BaseException:
+                # Ctrl-C ou service indisponible : les tranches en file d'attente ne sont pas envoyées
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+        progress.close()
+
+        return total_translated, total_errors
+
+    def translate_languages(self, trees):
+        """
+        Traduit plusieurs arbres de langue en une passe. trees : [(dossier de langue, langue cible,
+        fichiers)]. Chaque ligne source n'est analysée et masquée qu'une fois pour toutes les langues
+        (les fichiers de tl/<langue> ne diffèrent que par leurs en-têtes). Les tranches de toutes les
+        langues passent ensuite par la même file de travail, avec le même cache et le même limiteur,
+        et chaque arbre est réécrit dès que toutes ses tranches sont traduites.
+        """
+        self.line_memo = {}
+        try:
+            start = time.perf_counter()
+            jobs = []
+            for language, target_lang, rpy_files in trees:
+                rpy_files = self.pending_files(rpy_files)
+                texts = {}
+                for rpy_file in rpy_files:
+                    try:
+                        texts.update(dict.fromkeys(self.extract_file(rpy_file)))
+                    except Exception as e:
+                        thread_safe_print(f"❌ Erreur lors du traitement de {rpy_file}: {e}")
+                texts = list(texts)
+                chunks = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+                jobs.append((language, target_lang, rpy_files, chunks))
+            print(f"🔎 Extraction : {len(self.line_memo)} lignes distinctes analysées pour {len(jobs)} langues "
+                  f"({time.perf_counter() - start:.2f}s)")
+
+            total_translated = 0
+            total_errors = 0
+            remaining = {language: len(chunks) for language, _, _, chunks in jobs}
+            translations = {language: {} for language, _, _, _ in jobs}
+
+            def finish(language, rpy_files):
+                nonlocal total_translated, total_errors
+                translated_tree = 0
+                errors_tree = 0
+                for rpy_file in rpy_files:
+                    try:
+                        translated, errors = self.write_file(rpy_file, translations[language])
+                        translated_tree += translated
+                        errors_tree += errors
+                    except Exception as e:
+                        thread_safe_print(f"❌ Erreur lors de l'écriture de {rpy_file}: {e}")
+                        errors_tree += 1
+                del translations[language]
+                thread_safe_print(f"✓ {language} : {translated_tree} lignes traduites – ⚠ {errors_tree} erreurs "
+                                  f"({len(rpy_files)} fichiers)")
+                total_translated += translated_tree
+                total_errors += errors_tree
+
+            for language, _, rpy_files, chunks in jobs:
+                if not chunks:
+                    finish(language, rpy_files)
+
+            # Tranches entrelacées d'une langue à l'autre : toutes les langues avancent en même temps
+            tasks = [(language, target_lang, rpy_files, chunks[i])
+                     for i in range(max((len(chunks) for _, _, _, chunks in jobs), default=0))
+                     for language, target_lang, rpy_files, chunks in jobs if i < len(chunks)]
+            progress = tqdm(total=sum(len(texts) for _, _, _, texts in tasks), desc="Traduction", unit="txt")
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                future_to_task = {
+                    executor.submit(self.translate_batch, texts, target_lang): (language, rpy_files, texts)
+                    for language, target_lang, rpy_files, texts in tasks
+                }
                 try:
-                    translated, errors = future.result()
-                    total_translated += translated
-                    total_errors += errors
-                    completed_files += 1
-                    
-                    thread_safe_print(f"📋 Progression: {completed_files}/{len(rpy_files)} fichiers traités")
-                    
-                except Exception as e:
-                    thread_safe_print(f"❌ Erreur lors du traitement de {rpy_file}: {e}")
-                    total_errors += 1
-                    completed_files += 1
+                    for future in as_completed(future_to_task):
+                        language, rpy_files, texts = future_to_task[future]
+                        try:
+                            translations[language].update(future.result())
+                        except ServiceUnavailableError:
+                            raise
+                        except Exception as e:
+                            # Les textes de la tranche restent non traduits et sont comptés en erreur à l'écriture
+                            thread_safe_print(f"❌ Erreur lors de la traduction ({language}): {e}")
+                        progress.update(len(texts))
+                        remaining[language] -= 1
+                        if remaining[language] == 0:
+                            finish(language, rpy_files)
+                except BaseException:
+                    # Ctrl-C ou service indisponible : les tranches en file d'attente ne sont pas envoyées
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+            progress.close()
+            return total_translated, total_errors
+        finally:
+            self.line_memo = None
+
+    def translate_project_languages(self, game_path: str = None, languages: List[str] = None,
+                                    target_langs: List[str] = None):
+        """
+        Traduit un projet vers plusieurs langues (--lang fr,es,... --translation-lang french,spanish,...) ;
+        retourne True si tous les dossiers de langue ont été traités
+        """
+        if game_path is None:
+            game_path = self.find_game_folder()
+        if not game_path:
+            print("❌ Dossier 'game' introuvable! Assurez-vous d'être dans le répertoire du projet Ren'Py")
+            return False
+
+        print(f"🎮 Projet Ren'Py détecté: {game_path}")
+        trees = []
+        backups = []
+        for language, target_lang in zip(languages, target_langs):
+            translation_path = self.get_translation_path(game_path, language)
+            if not os.path.exists(translation_path):
+                print(f"❌ Dossier de traductions introuvable: {translation_path}")
+                continue
+            rpy_files = self.find_rpy_files(translation_path)
+            if not rpy_files:
+                print(f"❌ Aucun fichier .rpy trouvé dans {translation_path}")
+                continue
+            # Toutes les langues sous la même exécution : --restore latest les restaure ensemble
+            backup_path = self.create_backup(translation_path, run_id=backups[0] if backups else None)
+            if backup_path:
+                backups.append(backup_path)
+            print(f"📁 {language} ({target_lang}) : {len(rpy_files)} fichiers .rpy")
+            trees.append((language, target_lang, rpy_files))
+        if not trees:
+            return False
+
+        print(f"🚀 Lancement de la traduction de {len(trees)} langues avec {self.max_workers} threads...")
+        total_translated, total_errors = self.translate_languages(trees)
 
         self.generate_language_files(game_path)
         print(f"\n🎉 Traduction terminée : {total_translated} lignes traduites, {total_errors} erreurs.")
-        print(f"💾 Une sauvegarde est disponible dans : {backup_path}")
+        if backups:
+            print(f"💾 Sauvegardes disponibles : {', '.join(backups)} (restauration de toutes les langues : "
+                  f"--restore latest)")
+        return len(trees) == len(languages)
+
+    def plan_files(self, rpy_files: List[str], target_lang: str = 'fr', latency: float = 1.0) -> dict:
+        """
+        Estime le volume et la durée d'une traduction sans appeler le service (--plan) : seule
+        l'extraction est exécutée, le cache et le journal sont consultés sans être modifiés.
+        """
+        rpy_files = self.pending_files(rpy_files)
+        skipped = self.state.skipped if self.state is not None else 0
+        occurrences = 0
+        unique = {}
+        for rpy_file in tqdm(rpy_files, desc="Analyse", leave=False):
+            texts, _ = self.extract_occurrences(rpy_file)
+            occurrences += len(texts)
+            unique.update(dict.fromkeys(clean_text for clean_text, _ in texts))
+        skipped = (self.state.skipped - skipped) if self.state is not None else 0
 
-    def translate_project(self, game_path: str = None, language: str = "french", target_lang: str = 'fr'):
+        cached = 0
+        derived = 0
+        to_send = []
+        leaders = set()
+        for text in unique:
+            if not text.strip():
+                continue
+            if ((self.journal is not None and self.journal.get(self.service, target_lang, text) is not None)
+                    or (self.cache is not None and self.cache.get(self.service, target_lang, text, count=False))):
+                cached += 1
+                continue
+            if self.fuzzy:
+                group = similarity_group(text)
+                if group in leaders or self._recall_similar(text, target_lang) is not None:
+                    derived += 1
+                    continue
+                if group is not None:
+                    leaders.add(group)
+            to_send.append(text)
+
+        calls = sum(1 for _ in self.iter_batches(to_send))
+        http_requests = calls if self.pack_strings or self.backend.batch_requests else len(to_send)
+        parallel = self.async_engine.concurrency if self.async_engine is not None else self.max_workers
+        rate = self.rate_limiter.rate
+        # Le plus lent des deux plafonds : débit du limiteur ou requêtes simultanées
+        seconds = max(calls / rate, calls * latency / parallel) if calls else 0.0
+        plan = {
+            "files": len(rpy_files),
+            "strings": occurrences,
+            "skipped": skipped,
+            "unique": len(unique),
+            "characters": sum(len(text) for text in unique),
+            "cached": cached,
+            "derived": derived,
+            "to_translate": len(to_send),
+            "characters_to_translate": sum(len(text) for text in to_send),
+            "calls": calls,
+            "http_requests": http_requests,
+            "estimated_seconds": round(seconds, 1),
+        }
+        print(f"📋 Plan de traduction ({self.service} → {target_lang}, aucun appel au service)")
+        print(f"   Fichiers           : {plan['files']}")
+        print(f"   Textes             : {plan['strings']} ({plan['skipped']} déjà traduits ignorés)")
+        print(f"   Textes uniques     : {plan['unique']} ({plan['characters']} caractères)")
+        print(f"   Déjà en cache      : {plan['cached']}")
+        print(f"   Variantes déduites : {plan['derived']}")
+        print(f"   À traduire         : {plan['to_translate']} ({plan['characters_to_translate']} caractères)")
+        print(f"   Requêtes estimées  : {plan['calls']} lots de {self.batch_size} textes / {self.char_limit} "
+              f"caractères max ({plan['http_requests']} requêtes HTTP)")
+        print(f"   Durée estimée      : {time.strftime('%H:%M:%S', time.gmtime(seconds))} "
+              f"({rate:g} req/s, {parallel} en parallèle, {latency:g}s par requête, sans 429)")
+        return plan
+
+    def watch_project(self, game_path: str = None, language: str = "french", target_lang: str = 'fr',
+                      interval: float = 1.0, debounce: float = 2.0):
+        """Retraduit à la volée les fichiers de tl/<langue> régénérés par Ren'Py (Ctrl-C pour arrêter)"""
+        if game_path is None:
+            game_path = self.find_game_folder()
+        if not game_path:
+            print("❌ Dossier 'game' introuvable! Assurez-vous d'être dans le répertoire du projet Ren'Py")
+            return
+        translation_path = self.get_translation_path(game_path, language)
+        if not os.path.exists(translation_path):
+            print(f"❌ Dossier de traductions introuvable: {translation_path}")
+            return
+
+        # Une seule sauvegarde au lancement, pas à chaque modification
+        self.create_backup(translation_path)
+        watcher = FileWatcher(translation_path, interval=interval, debounce=debounce)
+        print(f"👀 Surveillance de {translation_path} ({len(watcher.index)} fichiers .rpy)")
+        watcher.start()
+        try:
+            while True:
+                for rpy_file in watcher.wait_changes():
+                    thread_safe_print(f"📝 Modifié : {os.path.relpath(rpy_file, translation_path)}")
+                    try:
+                        self.translate_file(rpy_file, target_lang)
+                    except ServiceUnavailableError as e:
+                        # La surveillance continue : le service sera de nouveau sollicité au prochain changement
+                        thread_safe_print(f"❌ Service indisponible ({e}), {os.path.basename(rpy_file)} non traduit")
+                        self.breaker.reset()
+                    except Exception as e:
+                        thread_safe_print(f"❌ Erreur lors du traitement de {rpy_file}: {e}")
+                    # Notre propre réécriture ne doit pas redéclencher une traduction
+                    watcher.refresh(rpy_file)
+                if self.state is not None:
+                    self.state.save()
+        except KeyboardInterrupt:
+            print("\n⏹ Fin de la surveillance")
+        finally:
+            watcher.stop()
+
+    def translate_project(self, game_path: str = None, language: str = "french", target_lang: str = 'fr',
+                          two_phase: bool = False):
         """Wrapper pour la compatibilité - utilise le traitement parallèle"""
-        self.translate_project_parallel(game_path, language, target_lang)
+        return self.translate_project_parallel(game_path, language, target_lang, two_phase=two_phase)
+
+class TranslationServer:
+    """
+    Mode service (--serve) : le traducteur reste en mémoire avec sa session HTTP, son cache et son
+    limiteur, et répond en JSON sur une API locale :
+    - POST /translate-strings {"texts": [...], "target": "fr"} -> {"translations": [...]}
+    - POST /translate-file {"path": "...rpy", "target": "fr"} -> {"translated": n, "errors": n}
+    - GET /status
+    Seuls les fichiers .rpy situés sous root (game/tl du projet) peuvent être réécrits.
+    """
+
+    def __init__(self, translator: RenpyAutoTranslator, host='127.0.0.1', port=8765, target_lang='fr',
+                 root: str = None):
+        self.translator = translator
+        self.target_lang = target_lang
+        self.root = os.path.realpath(root) if root else None
+        self.started = time.time()
+        self.counters = {"requests": 0, "strings": 0, "files": 0, "errors": 0}
+        self._lock = threading.Lock()
+        self._file_locks = {}
+        self.routes = {
+            '/translate-strings': self.translate_strings,
+            '/translate-file': self.translate_file,
+        }
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, name: str, value=1):
+        with self._lock:
+            self.counters[name] += value
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, payload):
+                body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.split('?')[0] == '/status':
+                    self._reply(200, server.status())
+                else:
+                    self._reply(404, {"error": "route inconnue"})
+
+            def do_POST(self):
+                route = server.routes.get(self.path.split('?')[0])
+                if route is None:
+                    self._reply(404, {"error": "route inconnue"})
+                    return
+                server._count("requests")
+                try:
+                    length = int(self.headers.get('Content-Length') or 0)
+                    body = json.loads(self.rfile.read(length) or b'{}')
+                    if not isinstance(body, dict):
+                        raise ValueError("objet JSON attendu")
+                    self._reply(200, route(body))
+                except ValueError as e:
+                    server._count("errors")
+                    self._reply(400, {"error": str(e)})
+                except ServiceUnavailableError as e:
+                    server._count("errors")
+                    # Le service reste en ligne : la requête suivante retentera le backend
+                    server.translator.breaker.reset()
+                    self._reply(503, {"error": str(e)})
+                except Exception as e:
+                    server._count("errors")
+                    thread_safe_print(f"❌ Erreur API {self.path}: {e}")
+                    self._reply(500, {"error": str(e)})
+
+        return Handler
+
+    def _target(self, body: dict) -> str:
+        target_lang = body.get("target", self.target_lang)
+        if not isinstance(target_lang, str) or not LANG_CODE_RE.match(target_lang):
+            raise ValueError('"target" doit être un code de langue (ex. "fr", "pt-BR")')
+        return target_lang
+
+    def translate_strings(self, body: dict) -> dict:
+        texts = body.get("texts")
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            raise ValueError('"texts" doit être une liste de chaînes')
+        translations = self.translator.translate_strings(texts, self._target(body))
+        self._count("strings", len(texts))
+        return {"translations": translations}
+
+    def translate_file(self, body: dict) -> dict:
+        path = body.get("path")
+        if not isinstance(path, str) or not path.endswith('.rpy') or not os.path.isfile(path):
+            raise ValueError('"path" doit désigner un fichier .rpy existant')
+        # Liens symboliques et ".." résolus : aucun fichier hors du dossier des traductions n'est réécrit
+        real_path = os.path.realpath(path)
+        if self.root is None or os.path.commonpath([self.root, real_path]) != self.root:
+            raise ValueError(f'"path" doit être situé dans {self.root or "le dossier game/tl du projet"}')
+        target_lang = self._target(body)
+        # Deux requêtes sur le même fichier sont traitées l'une après l'autre
+        with self._lock:
+            file_lock = self._file_locks.setdefault(os.path.normcase(os.path.abspath(path)), threading.Lock())
+        with file_lock:
+            start = time.perf_counter()
+            texts = self.translator.extract_file(path)
+            translations = self.translator.translate_batch(texts, target_lang, max_workers=self.translator.max_workers)
+            translated, errors = self.translator.write_file(path, translations)
+            if self.translator.state is not None:
+                self.translator.state.save()
+        self._count("files")
+        return {"path": path, "translated": translated, "errors": errors,
+                "seconds": round(time.perf_counter() - start, 3)}
+
+    def status(self) -> dict:
+        translator = self.translator
+        with self._lock:
+            counters = dict(self.counters)
+        status = {
+            "service": translator.service,
+            "target": self.target_lang,
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "rate_limit": round(translator.rate_limiter.rate, 2),
+            "cache_entries": len(translator.cache) if translator.cache is not None else None,
+            **counters,
+        }
+        if translator.metrics is not None:
+            status["metrics"] = translator.metrics.snapshot()
+        return status
+
+    def serve_forever(self):
+        print(f"🛰 API de traduction à l'écoute sur {self.url} (Ctrl-C pour arrêter)")
+        print(f"📁 Fichiers modifiables : {self.root or 'aucun (dossier game introuvable, /translate-file désactivé)'}")
+        if not ipaddress.ip_address(self.httpd.server_address[0]).is_loopback:
+            print("⚠ L'API n'a pas d'authentification : toute machine du réseau peut l'appeler")
+        # SIGTERM (gestionnaire de services, kill) arrête proprement comme Ctrl-C : cache et état sont sauvegardés
+        signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+        try:
+            self.httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\n⏹ Arrêt du service")
+        finally:
+            self.httpd.server_close()
+
+def _raise_keyboard_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+# Copie du traducteur (sans réseau) installée dans chaque processus CPU
+_cpu_translator = None
+
+def _init_cpu_worker(translator: RenpyAutoTranslator):
+    global _cpu_translator
+    _cpu_translator = translator
+
+def _extract_file_job(input_file: str):
+    return _cpu_translator.extract_occurrences(input_file)
+
+def _rewrite_file_job(input_file: str, translations: dict):
+    return _cpu_translator.rewrite_file(input_file, translations)
 
 def main():
     print("🎮 Auto-traducteur Ren'Py - Version Parallèle")
@@ -475,88 +2687,362 @@ def main():
     
     parser = argparse.ArgumentParser(description='Auto-traducteur automatique pour projets Ren\'Py')
     parser.add_argument('-p', '--path', help='Chemin vers le dossier game (détection automatique par défaut)')
-    parser.add_argument('-l', '--lang', default='fr', help='Langue cible (par défaut: fr)')
-    parser.add_argument('--translation-lang', default='french', help='Dossier de langue (par défaut: french)')
-    parser.add_argument('-s', '--service', choices=['google', 'libretranslate'], 
+    parser.add_argument('-l', '--lang', default='fr',
+                       help='Langue cible, ou plusieurs séparées par des virgules : fr,es,de (par défaut: fr)')
+    parser.add_argument('--translation-lang', default='french',
+                       help='Dossier de langue, un par langue cible : french,spanish,german (par défaut: french)')
+    parser.add_argument('-s', '--service', choices=sorted(BACKENDS), 
                        default='google', help='Service de traduction (par défaut: google)')
     parser.add_argument('--libretranslate-url', default='http://localhost:5000',
                        help='URL LibreTranslate (par défaut: http://localhost:5000)')
+    parser.add_argument('--processes', type=int, default=None,
+                       help='Processus de traduction locale pour le service argos (par défaut: nombre de cœurs)')
+    parser.add_argument('--source-lang', default='en',
+                       help='Langue source pour le service argos (par défaut: en)')
+    parser.add_argument('--cpu-processes', type=int, default=0,
+                       help='Processus pour l\'extraction et la réécriture des fichiers (par défaut: 0 = désactivé)')
+    parser.add_argument('--metrics-out', metavar='FICHIER',
+                       help='Écrit les métriques de l\'exécution (temps par étape, requêtes, cache...) en JSON')
+    parser.add_argument('--metrics-port', type=int, default=None,
+                       help='Expose les métriques au format Prometheus sur http://127.0.0.1:PORT/metrics')
+    parser.add_argument('--install-deps', action='store_true',
+                       help='Installe les dépendances manquantes du service choisi (pip) puis quitte')
+    parser.add_argument('--watch', action='store_true',
+                       help='Surveille tl/<langue> et traduit les fichiers régénérés par Ren\'Py au fil de l\'eau')
+    parser.add_argument('--watch-interval', type=float, default=1.0,
+                       help='Intervalle de vérification en secondes pour --watch (par défaut: 1)')
+    parser.add_argument('--watch-debounce', type=float, default=2.0,
+                       help='Délai sans modification avant de traduire un fichier (par défaut: 2s)')
+    parser.add_argument('--plan', '--dry-run', dest='plan', action='store_true',
+                       help='Estime le volume et la durée de la traduction sans appeler le service')
+    parser.add_argument('--plan-latency', type=float, default=1.0,
+                       help='Durée supposée d\'une requête pour l\'estimation de --plan (par défaut: 1s)')
+    parser.add_argument('--serve', action='store_true',
+                       help='Lance une API HTTP locale (translate-file, translate-strings, status) au lieu de traduire')
+    parser.add_argument('--serve-host', default='127.0.0.1', help='Adresse d\'écoute de --serve (par défaut: 127.0.0.1)')
+    parser.add_argument('--serve-port', type=int, default=8765, help='Port de --serve (par défaut: 8765)')
+    parser.add_argument('--check', action='store_true', help='Vérifie que le service de traduction répond puis quitte')
     parser.add_argument('-f', '--file', help='Traduire un fichier spécifique au lieu du projet complet')
     parser.add_argument('--files', nargs='+', help='Traduire plusieurs fichiers RPY dans le dossier de langue')
     parser.add_argument('--max-workers', type=int, default=3, 
                        help='Nombre max de fichiers traités en parallèle (par défaut: 3)')
+    parser.add_argument('--batch-size', type=int, default=50,
+                       help='Nombre max de textes envoyés par requête de traduction (par défaut: 50)')
+    parser.add_argument('--pack', dest='pack_strings', action='store_true', default=None,
+                       help='Regroupe les textes d\'un lot en une seule requête à marqueurs numérotés '
+                            '(par défaut avec google)')
+    parser.add_argument('--no-pack', dest='pack_strings', action='store_false',
+                       help='Envoie les textes d\'un lot séparément')
+    parser.add_argument('--no-fuzzy', action='store_true',
+                       help='Désactive la réutilisation des traductions de textes quasi identiques')
+    parser.add_argument('--two-phase', action='store_true',
+                       help='Extrait tous les textes du projet, traduit chaque texte unique une seule fois, puis réécrit les fichiers')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                       help='Moteur asyncio : traduit les textes de tout le projet en requêtes simultanées')
+    parser.add_argument('--concurrency', type=int, default=None,
+                       help='Nombre max de requêtes simultanées en mode --async '
+                            '(par défaut: 4 pour google, 16 pour libretranslate)')
+    parser.add_argument('--rate-limit', type=float, default=None,
+                       help='Débit initial en requêtes/s, ajusté automatiquement '
+                            '(par défaut: 5 pour google, 20 pour libretranslate)')
+    parser.add_argument('--max-retries', type=int, default=5,
+                       help='Nombre de nouvelles tentatives sur erreur 429/5xx ou réseau (par défaut: 5)')
+    parser.add_argument('--max-failed-batches', type=int, default=5,
+                       help='Arrêt après N lots consécutifs en échec, service banni ou hors ligne '
+                            '(par défaut: 5, 0 = jamais)')
+    parser.add_argument('--state-file', default='translation_state.json',
+                       help='Fichier d\'état de la traduction incrémentale (par défaut: translation_state.json)')
+    parser.add_argument('--no-state', action='store_true',
+                       help='Ignore l\'état incrémental : tous les textes entre guillemets sont traduits')
+    parser.add_argument('--resume', action='store_true',
+                       help='Reprend une exécution interrompue à partir du journal de reprise')
+    parser.add_argument('--journal-file',
+                       help='Journal de reprise (par défaut: translation_journal_<langue>_<hash>.jsonl, '
+                            'propre aux dossiers de langue traduits)')
+    parser.add_argument('--backup-dir', default='backup_translations',
+                       help='Dossier des sauvegardes dédupliquées (par défaut: backup_translations)')
+    parser.add_argument('--backup-keep', type=int, default=10,
+                       help='Nombre de sauvegardes conservées par dossier de langue (par défaut: 10, 0 = illimité)')
+    parser.add_argument('--backup-compress', action='store_true', help='Compresse les fichiers sauvegardés (gzip)')
+    parser.add_argument('--list-backups', action='store_true', help='Liste les sauvegardes disponibles')
+    parser.add_argument('--restore', metavar='ID', help='Restaure une sauvegarde (identifiant ou "latest")')
+    parser.add_argument('--cache-file', default='translation_cache.sqlite',
+                       help='Fichier du cache de traduction (par défaut: translation_cache.sqlite)')
+    parser.add_argument('--no-cache', action='store_true', help='Désactive le cache de traduction')
+    parser.add_argument('--cache-max-entries', type=int, default=200000,
+                       help='Nombre max d\'entrées conservées dans le cache (par défaut: 200000, 0 = illimité)')
+    parser.add_argument('--cache-max-age', type=int, default=90,
+                       help='Âge max en jours des entrées inutilisées du cache (par défaut: 90, 0 = illimité)')
     
     args = parser.parse_args()
-    
+
+    # Plusieurs langues cibles : une seule passe d'extraction, un dossier de langue par cible
+    target_langs = [lang.strip() for lang in args.lang.split(',') if lang.strip()]
+    folders = [folder.strip() for folder in args.translation_lang.split(',') if folder.strip()]
+    if len(target_langs) != len(folders):
+        print(f"❌ --lang ({len(target_langs)} langues) et --translation-lang ({len(folders)} dossiers) "
+              f"doivent avoir le même nombre d'éléments")
+        sys.exit(1)
+    if len(target_langs) > 1 and (args.file or args.watch or args.serve):
+        print("❌ Plusieurs langues cibles ne sont possibles qu'en mode projet ou --files")
+        sys.exit(1)
+    if len(target_langs) > 1 and (args.use_async or args.two_phase or args.cpu_processes):
+        # Les langues partagent une file de tranches de --batch-size textes, traitée par les threads
+        print("❌ --async, --two-phase et --cpu-processes ne sont pas disponibles avec plusieurs langues cibles")
+        sys.exit(1)
+    args.lang, args.translation_lang = target_langs[0], folders[0]
+    args.languages = list(zip(folders, target_langs))
+
+    backup_store = BackupStore(args.backup_dir, keep=args.backup_keep, compress=args.backup_compress)
+    if args.list_backups or args.restore:
+        # La gestion des sauvegardes ne sollicite aucun service : pas de vérification des dépendances
+        manage_backups(backup_store, args)
+        return
+
+    # --plan n'appelle pas le service et se passe de tqdm : aucune dépendance requise
+    missing = [] if args.plan and not args.install_deps else check_dependencies(args.service)
+    if args.install_deps:
+        if missing and install_dependencies(missing):
+            print("✓ Relancez la commande pour démarrer la traduction")
+        elif not missing:
+            print("✓ Toutes les dépendances sont installées")
+        return
+    if missing:
+        print(f"❌ Dépendances manquantes : {', '.join(missing)}")
+        print(f"Installez-les avec : pip install {' '.join(repr(name) for name in missing)} "
+              f"(ou relancez avec --install-deps)")
+        sys.exit(1)
+
     # Limite le nombre de workers pour éviter la surcharge
     max_workers = min(args.max_workers, 5)  # Max 5 threads
     
+    backend = create_backend(args.service, libretranslate_url=args.libretranslate_url,
+                             processes=args.processes, source_lang=args.source_lang)
+    if args.check:
+        healthy = backend.health_check(args.lang)
+        print(f"{'✓' if healthy else '❌'} Service {args.service} {'disponible' if healthy else 'indisponible'}")
+        backend.close()
+        return
+
+    # Journal de reprise pour les traductions de projet ou --files seulement : inutile pour un service
+    # sans fin (--serve/--watch), sans traduction (--plan) ou pour un fichier isolé (--file)
+    journal = None
+    journal_path = None
+    if not (args.serve or args.watch or args.plan or args.file):
+        journal_path = args.journal_file or default_journal_path(args)
+    if journal_path:
+        try:
+            journal = CheckpointJournal(journal_path, resume=args.resume)
+        except FileExistsError as e:
+            print(f"❌ {e}")
+            backend.close()
+            sys.exit(1)
+
+    cache = None
+    if not args.no_cache:
+        cache = TranslationCache(args.cache_file, max_entries=args.cache_max_entries,
+                                 max_age_days=args.cache_max_age)
+        print(f"🧠 Cache de traduction: {args.cache_file} ({len(cache)} entrées)")
+
+    concurrency = None
+    if args.use_async:
+        # Pas de plafond fixe : la concurrence dépend de ce que le backend supporte
+        concurrency = args.concurrency or backend.default_concurrency
+
+    metrics = None
+    if args.metrics_out or args.metrics_port is not None:
+        metrics = RunMetrics()
+        if args.metrics_port is not None:
+            metrics.serve(args.metrics_port)
+
     translator = RenpyAutoTranslator(
         service=args.service,
         libretranslate_url=args.libretranslate_url,
-        max_workers=max_workers
+        max_workers=max_workers,
+        cache=cache,
+        batch_size=args.batch_size,
+        concurrency=concurrency,
+        rate_limit=args.rate_limit,
+        max_retries=args.max_retries,
+        state=None if args.no_state else TranslationState(args.state_file),
+        journal=journal,
+        backup_store=backup_store,
+        backend=backend,
+        cpu_processes=args.cpu_processes,
+        metrics=metrics,
+        pack_strings=args.pack_strings,
+        fuzzy=not args.no_fuzzy,
+        max_failed_batches=args.max_failed_batches
     )
     
-    print(f"⚙️ Configuration: {args.service} avec {max_workers} thread(s) parallèle(s)")
+    if concurrency:
+        print(f"⚙️ Configuration: {args.service} en mode asyncio avec {concurrency} requête(s) simultanée(s)")
+    else:
+        print(f"⚙️ Configuration: {args.service} avec {max_workers} thread(s) parallèle(s)")
+    
+    completed = False
+    exit_code = 0
+    try:
+        if args.serve:
+            game_path = args.path or translator.find_game_folder()
+            TranslationServer(translator, args.serve_host, args.serve_port, target_lang=args.lang,
+                              root=os.path.join(game_path, 'tl') if game_path else None).serve_forever()
+        else:
+            completed = run(translator, args)
+    except KeyboardInterrupt:
+        print("\n⏸ Interruption" + (" : relancez avec --resume pour reprendre" if journal is not None else ""))
+    except ServiceUnavailableError as e:
+        print(f"\n❌ Service {args.service} indisponible, arrêt de la traduction : {e}")
+        if journal is not None:
+            print("   Relancez plus tard avec --resume pour reprendre")
+        exit_code = 1
+    finally:
+        translator.close(completed=completed)
+        if metrics is not None:
+            if args.metrics_out:
+                metrics.write_json(args.metrics_out)
+                print(f"📊 Métriques écrites dans {args.metrics_out}")
+            metrics.close()
+    if exit_code:
+        sys.exit(exit_code)
+
+def manage_backups(backup_store: BackupStore, args):
+    """Modes --list-backups et --restore"""
+    if args.list_backups:
+        manifests = backup_store.list_backups()
+        if not manifests:
+            print(f"ℹ Aucune sauvegarde dans {backup_store.root}")
+        for manifest in manifests:
+            created = datetime.fromtimestamp(manifest["created"]).strftime("%Y-%m-%d %H:%M:%S")
+            run = f" (exécution {manifest['run']})" if manifest.get("run", manifest["id"]) != manifest["id"] else ""
+            print(f"💾 {manifest['id']}{run} – {created} – {len(manifest['files'])} fichiers – {manifest['source']}")
+        return
+    try:
+        for manifest in backup_store.load_run(args.restore):
+            count, removed = backup_store.restore(manifest["id"])
+            print(f"✓ Sauvegarde {manifest['id']} restaurée : {count} fichiers dans {manifest['source']}")
+            for rel_path in removed:
+                print(f"   🗑 Supprimé (absent de la sauvegarde) : {rel_path}")
+    except FileNotFoundError as e:
+        print(f"❌ Sauvegarde introuvable : {e}")
+
+def default_journal_path(args) -> str:
+    """
+    Journal propre aux dossiers de langue traduits : deux exécutions sur des projets ou des langues
+    différents ne partagent ni ne suppriment le même journal. None si le dossier 'game' est introuvable.
+    """
+    game_path = args.path or RenpyAutoTranslator.find_game_folder()
+    if not game_path:
+        return None
+    trees = sorted(os.path.normcase(os.path.abspath(os.path.join(game_path, 'tl', language)))
+                   for language, _ in args.languages)
+    digest = hashlib.sha256("\n".join(trees).encode('utf-8')).hexdigest()[:12]
+    return f"translation_journal_{'_'.join(language for language, _ in args.languages)}_{digest}.jsonl"
+
+def resolve_files(translator: RenpyAutoTranslator, args, language: str = None) -> List[str]:
+    """Chemins complets des fichiers passés à --files, dans le dossier de langue"""
+    game_path = args.path if args.path else translator.find_game_folder()
+    if not game_path:
+        print("❌ Dossier 'game' introuvable")
+        return []
+
+    translation_path = translator.get_translation_path(game_path, language or args.translation_lang)
     
+    # Créer la liste des fichiers complets
+    file_paths = []
+    for filename in args.files:
+        file_path = os.path.join(translation_path, filename)
+        if os.path.exists(file_path):
+            file_paths.append(file_path)
+        else:
+            print(f"❌ Fichier introuvable : {file_path}")
+    return file_paths
+
+def run(translator: RenpyAutoTranslator, args) -> bool:
+    """
+    Exécute le mode demandé (fichier, multi-fichiers ou projet complet).
+    Retourne True si une traduction est allée jusqu'au bout : le journal de reprise peut être supprimé.
+    """
+    # Mode estimation : extraction seule, sans appel au service ni écriture
+    if args.plan:
+        for language, target_lang in args.languages:
+            if args.file:
+                rpy_files = [args.file] if os.path.exists(args.file) else []
+            elif args.files:
+                rpy_files = resolve_files(translator, args, language)
+            else:
+                game_path = args.path or translator.find_game_folder()
+                translation_path = translator.get_translation_path(game_path, language) if game_path else None
+                rpy_files = translator.find_rpy_files(translation_path) if translation_path else []
+            if not rpy_files:
+                print(f"❌ Aucun fichier .rpy à analyser ({language})")
+                continue
+            translator.plan_files(rpy_files, target_lang, latency=args.plan_latency)
+        return False
+
+    # Plusieurs langues cibles : extraction partagée, traductions de toutes les langues en parallèle
+    if len(args.languages) > 1:
+        if args.files:
+            trees = [(language, target_lang, resolve_files(translator, args, language))
+                     for language, target_lang in args.languages]
+            complete = all(len(rpy_files) == len(args.files) for _, _, rpy_files in trees)
+            trees = [tree for tree in trees if tree[2]]
+            if not trees:
+                return False
+            total_translated, total_errors = translator.translate_languages(trees)
+            print(f"✅ Terminé: {total_translated} lignes traduites, {total_errors} erreurs au total")
+            return complete
+        return translator.translate_project_languages(
+            game_path=args.path,
+            languages=[language for language, _ in args.languages],
+            target_langs=[target_lang for _, target_lang in args.languages]
+        )
+
     # Mode fichier unique
     if args.file:
-        if os.path.exists(args.file):
-            print(f"📝 Traduction du fichier: {args.file}")
-            translated, errors = translator.translate_file(args.file, args.lang)
-            print(f"✅ Terminé: {translated} lignes traduites, {errors} erreurs")
-        else:
+        if translator.journal is not None and translator.journal.is_finished(args.file):
+            print(f"♻ Fichier déjà terminé : {args.file}")
+            return True
+        if not os.path.exists(args.file):
             print(f"❌ Fichier introuvable: {args.file}")
-        return
+            return False
+        print(f"📝 Traduction du fichier: {args.file}")
+        translated, errors = translator.translate_file(args.file, args.lang)
+        print(f"✅ Terminé: {translated} lignes traduites, {errors} erreurs")
+        return True
 
     # Mode multi-fichiers dans le dossier langue (avec parallélisation)
     if args.files:
-        game_path = args.path if args.path else translator.find_game_folder()
-        if not game_path:
-            print("❌ Dossier 'game' introuvable")
-            return
+        file_paths = resolve_files(translator, args)
+        if not file_paths:
+            return False
+        print(f"🚀 Traduction parallèle de {len(file_paths)} fichiers...")
+        if args.two_phase or args.use_async or args.cpu_processes:
+            total_translated, total_errors = translator.translate_files_two_phase(file_paths, args.lang)
+        else:
+            total_translated, total_errors = translator.translate_files_parallel(file_paths, args.lang)
 
-        translation_path = translator.get_translation_path(game_path, args.translation_lang)
-        
-        # Créer la liste des fichiers complets
-        file_paths = []
-        for filename in args.files:
-            file_path = os.path.join(translation_path, filename)
-            if os.path.exists(file_path):
-                file_paths.append(file_path)
-            else:
-                print(f"❌ Fichier introuvable : {file_path}")
-        
-        if file_paths:
-            print(f"🚀 Traduction parallèle de {len(file_paths)} fichiers...")
-            total_translated = 0
-            total_errors = 0
-            
-            # Traitement parallèle des fichiers spécifiés
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                future_to_file = {
-                    executor.submit(translator.translate_file, file_path, args.lang): file_path 
-                    for file_path in file_paths
-                }
-                
-                for future in as_completed(future_to_file):
-                    file_path = future_to_file[future]
-                    try:
-                        translated, errors = future.result()
-                        total_translated += translated
-                        total_errors += errors
-                    except Exception as e:
-                        print(f"❌ Erreur lors du traitement de {file_path}: {e}")
-                        total_errors += 1
-            
-            print(f"✅ Terminé: {total_translated} lignes traduites, {total_errors} erreurs au total")
-        return
+        print(f"✅ Terminé: {total_translated} lignes traduites, {total_errors} erreurs au total")
+        # Un fichier introuvable n'a pas été traité : le journal est conservé pour la reprise
+        return len(file_paths) == len(args.files)
     
+    # Mode surveillance : seuls les fichiers modifiés sont retraduits
+    if args.watch:
+        translator.watch_project(
+            game_path=args.path,
+            language=args.translation_lang,
+            target_lang=args.lang,
+            interval=args.watch_interval,
+            debounce=args.watch_debounce
+        )
+        return False
+
     # Mode projet complet avec parallélisation
-    translator.translate_project(
+    return translator.translate_project(
         game_path=args.path,
         language=args.translation_lang,
-        target_lang=args.lang
+        target_lang=args.lang,
+        two_phase=args.two_phase
     )
 
 if __name__ == "__main__":
@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmarks hors ligne de l'auto-traducteur Ren'Py.
+
+    python benchmark.py classifier --blocks 20000
+    python benchmark.py e2e --files 20 --blocks 2000 --latency 0.05 --error-rate 0.01 --server-rps 200
+"""
+
+import os
+import re
+import json
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import threading
+import tracemalloc
+from typing import List
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import AutoRenpyTranslator as art
+
+WORDS = ("the", "a", "you", "I", "we", "know", "think", "really", "maybe", "never", "always",
+         "tonight", "school", "friend", "house", "door", "light", "dark", "love", "time",
+         "again", "here", "there", "don't", "can't", "what", "why", "hello", "sorry", "please")
+TAGS = ("[name]", "[player]", "{b}", "{/b}", "{i}", "{/i}", "{w}", "{p}", "{color=#f00}", "{/color}", "\\n")
+CHARACTERS = ("e", "m", "s", "mc", "narrator")
+REPEATED = ("...", "Yes.", "No.", "What?", "Hmm...", "Okay.", "[name]!", "I see.")
+
+
+def random_sentence(rng: random.Random, tag_density: float = 0.2) -> str:
+    words = []
+    for _ in range(rng.randint(2, 14)):
+        if rng.random() < tag_density:
+            words.append(rng.choice(TAGS))
+        words.append(rng.choice(WORDS))
+    sentence = " ".join(words)
+    return sentence[0].upper() + sentence[1:] + rng.choice((".", "!", "?", "..."))
+
+
+def generate_rpy_lines(blocks: int, seed: int = 0, tag_density: float = 0.2,
+                       repetition: float = 0.2, language: str = "french") -> List[str]:
+    """Génère un fichier de traduction Ren'Py synthétique (dialogues + bloc strings)"""
+    rng = random.Random(seed)
+    lines = []
+    for i in range(blocks):
+        if rng.random() < repetition:
+            text = rng.choice(REPEATED)
+        else:
+            text = random_sentence(rng, tag_density)
+        who = rng.choice(CHARACTERS)
+        lines.append(f"# game/script.rpy:{i * 3 + 1}\n")
+        lines.append(f"translate {language} start_{i:08x}:\n")
+        lines.append("\n")
+        lines.append(f'    # {who} "{text}"\n')
+        lines.append(f'    {who} "{text}"\n')
+        lines.append("\n")
+    lines.append(f"translate {language} strings:\n")
+    lines.append("\n")
+    for i in range(max(1, blocks // 10)):
+        text = random_sentence(rng, tag_density / 2)
+        lines.append(f'    old "{text}"\n')
+        lines.append(f'    new "{text}"\n')
+        lines.append("\n")
+        if i % 7 == 0:
+            lines.append(f'    old "images/bg_{i}.png"\n')
+            lines.append(f'    new "images/bg_{i}.png"\n')
+            lines.append("\n")
+    return lines
+
+
+def generate_tl_tree(root: str, files: int, blocks: int, seed: int = 0, tag_density: float = 0.2,
+                     repetition: float = 0.2, language: str = "french") -> str:
+    """Crée une arborescence game/tl/<language> synthétique ; retourne le chemin du dossier game"""
+    game_path = os.path.join(root, "game")
+    translation_path = os.path.join(game_path, "tl", language)
+    os.makedirs(translation_path, exist_ok=True)
+    for i in range(files):
+        # Tailles hétérogènes : quelques gros scripts et beaucoup de petits fichiers
+        file_blocks = blocks if i == 0 else max(1, blocks // (i + 1))
+        lines = generate_rpy_lines(file_blocks, seed=seed + i, tag_density=tag_density,
+                                   repetition=repetition, language=language)
+        with open(os.path.join(translation_path, f"script_{i:03d}.rpy"), 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+    return game_path
+
+
+class _BenchHTTPServer(ThreadingHTTPServer):
+    # File d'attente plus large que la valeur par défaut (5) pour encaisser les rafales concurrentes
+    request_queue_size = 256
+    daemon_threads = True
+
+
+class MockLibreTranslateServer:
+    """
+    Serveur local imitant l'endpoint /translate de LibreTranslate, sans réseau :
+    latence configurable, taux d'erreurs 500 et limite de débit répondant par des 429.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.0, jitter=0.0, error_rate=0.0,
+                 max_rps=None, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.max_rps = max_rps
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.request_times = []
+        self.strings = 0
+        self.characters = 0
+        self.errors = 0
+        self.throttled = 0
+        self._tokens = max_rps or 0
+        self._updated = time.monotonic()
+        self.httpd = _BenchHTTPServer((host, port), self._make_handler())
+        self.url = f"http://{host}:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _allow(self) -> bool:
+        if not self.max_rps:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self._tokens = min(self.max_rps, self._tokens + (now - self._updated) * self.max_rps)
+            self._updated = now
+            if self._tokens < 1:
+                self.throttled += 1
+                return False
+            self._tokens -= 1
+            return True
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, payload, headers=None):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                self._reply(200, [{"code": "fr", "name": "French"}])
+
+            def do_POST(self):
+                start = time.perf_counter()
+                length = int(self.headers.get("Content-Length", 0))
+                data = json.loads(self.rfile.read(length) or b"{}")
+                if not server._allow():
+                    self._reply(429, {"error": "Too many requests"}, {"Retry-After": "1"})
+                    return
+                with server.lock:
+                    fail = server.rng.random() < server.error_rate
+                    delay = server.latency + server.rng.uniform(0, server.jitter)
+                time.sleep(delay)
+                if fail:
+                    with server.lock:
+                        server.errors += 1
+                    self._reply(500, {"error": "Internal error"})
+                    return
+                q = data.get("q", "")
+                texts = q if isinstance(q, list) else [q]
+                translated = [f"({data.get('target', 'xx')}) {text}" for text in texts]
+                self._reply(200, {"translatedText": translated if isinstance(q, list) else translated[0]})
+                with server.lock:
+                    server.request_times.append(time.perf_counter() - start)
+                    server.strings += len(texts)
+                    server.characters += sum(len(text) for text in texts)
+
+        return Handler
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def legacy_extract_line(translator, line: str):
+    """Version d'origine de l'extraction : six re.match par ligne et motifs recompilés"""
+    ignore_patterns = [
+        r'^\s*#',
+        r'^\s*$',
+        r'^\s*old\s+"',
+        r'^\s*new\s+"old:.*"',
+        r'^\s*new\s*".*_\d+(\.\d+)*_?\d*"',
+        r'.*\.(webp|webm|mp4|mov|png|jpg|jpeg|gif|bmp|mp3|ogg|wav|mp4|mkv|avi|mov|flac|svg|ico|ttf|otf|eot|woff2?).*"',
+    ]
+    if any(re.match(p, line) for p in ignore_patterns):
+        return None
+
+    def format_text(text):
+        text = re.sub(r'(?<!\s)(?<=\w)\[', ' [', text)
+        text = re.sub(r'\](?=\w)', '] ', text)
+        text = re.sub(r'(?<!\s)(\{[^}]+\})', r' \1', text)
+        text = re.sub(r'(\{[^}]+\})(?!\s)', r'\1 ', text)
+        return text
+
+    def preserve_renpy_tags(text):
+        pattern = re.compile(r'(\{[^}]*\}|\\n|\\t|\\r|\[[^\]]*\])')
+        tags = []
+
+        def replacer(match):
+            tags.append(match.group(0))
+            return f' RENPYTAG{len(tags)-1}END '
+
+        return pattern.sub(replacer, text), tags
+
+    segments = []
+    for match in re.finditer(r'"((?:[^"\\]|\\.)*)"', line):
+        original_text = match.group(1)
+        clean_text, tags = preserve_renpy_tags(format_text(original_text))
+        if not re.sub(r'\s*RENPYTAG\d+END\s*', '', clean_text).strip():
+            segments.append((original_text, None, None))
+        else:
+            segments.append((original_text, clean_text, tags))
+    return segments or None
+
+
+def measure(func, lines: List[str], repeat: int) -> float:
+    """Retourne le meilleur débit (lignes/s) sur plusieurs passes"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for line in lines:
+            func(line)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(lines) / best if best else float('inf')
+
+
+def bench_classifier(args):
+    translator = art.RenpyAutoTranslator(service='libretranslate', cache=None)
+    lines = generate_rpy_lines(args.blocks, seed=args.seed, tag_density=args.tag_density,
+                               repetition=args.repetition)
+    print(f"📄 Corpus synthétique: {len(lines)} lignes")
+
+    # Les deux implémentations doivent produire exactement les mêmes segments
+    mismatches = sum(1 for line in lines
+                     if legacy_extract_line(translator, line) != translator.extract_line(line))
+    if mismatches:
+        print(f"❌ {mismatches} lignes extraites différemment")
+
+    before = measure(lambda line: legacy_extract_line(translator, line), lines, args.repeat)
+    after = measure(translator.extract_line, lines, args.repeat)
+    print(f"⏱ Avant : {before:,.0f} lignes/s")
+    print(f"⏱ Après : {after:,.0f} lignes/s (x{after / before:.2f})")
+    translator.close()
+
+
+def bench_e2e(args):
+    workdir = tempfile.mkdtemp(prefix="renpy_bench_")
+    previous_cwd = os.getcwd()
+    try:
+        game_path = generate_tl_tree(workdir, args.files, args.blocks, seed=args.seed,
+                                     tag_density=args.tag_density, repetition=args.repetition)
+        print(f"📁 Arborescence synthétique: {args.files} fichiers dans {game_path}")
+
+        with MockLibreTranslateServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                                      max_rps=args.server_rps, seed=args.seed) as server:
+            translator = art.RenpyAutoTranslator(
+                service='libretranslate',
+                libretranslate_url=server.url,
+                max_workers=args.max_workers,
+                batch_size=args.batch_size,
+                concurrency=args.concurrency if args.use_async else None,
+                rate_limit=args.rate_limit,
+                max_retries=args.max_retries
+            )
+            # Les sauvegardes sont créées dans le répertoire courant
+            os.chdir(workdir)
+            tracemalloc.start()
+            start = time.perf_counter()
+            translator.translate_project_parallel(game_path, two_phase=args.two_phase)
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            translator.close()
+
+        print("\n📊 Résultats")
+        print(f"   Durée totale       : {elapsed:.2f}s")
+        print(f"   Textes traduits    : {server.strings} ({server.strings / elapsed:,.0f} textes/s)")
+        print(f"   Requêtes réussies  : {len(server.request_times)} "
+              f"({server.characters} caractères envoyés)")
+        print(f"   Erreurs 500 / 429  : {server.errors} / {server.throttled}")
+        print(f"   Latence p50 / p99  : {percentile(server.request_times, 50) * 1000:.1f} ms / "
+              f"{percentile(server.request_times, 99) * 1000:.1f} ms")
+        print(f"   Mémoire max        : {peak / 1024 / 1024:.1f} Mo")
+    finally:
+        os.chdir(previous_cwd)
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+        else:
+            print(f"📂 Données conservées dans {workdir}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks hors ligne de l'auto-traducteur Ren'Py")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    classifier = subparsers.add_parser('classifier', help="Débit d'extraction des lignes (avant/après)")
+    classifier.add_argument('--blocks', type=int, default=20000, help='Nombre de blocs de dialogue générés')
+    classifier.add_argument('--repeat', type=int, default=3, help='Nombre de passes (meilleur temps retenu)')
+    classifier.add_argument('--seed', type=int, default=0)
+    classifier.add_argument('--tag-density', type=float, default=0.2, help='Probabilité de balise par mot')
+    classifier.add_argument('--repetition', type=float, default=0.2, help='Proportion de répliques répétées')
+    classifier.set_defaults(func=bench_classifier)
+
+    e2e = subparsers.add_parser('e2e', help='Traduction complète contre un serveur LibreTranslate simulé')
+    e2e.add_argument('--files', type=int, default=20, help='Nombre de fichiers .rpy générés')
+    e2e.add_argument('--blocks', type=int, default=2000, help='Blocs de dialogue du plus gros fichier')
+    e2e.add_argument('--seed', type=int, default=0)
+    e2e.add_argument('--tag-density', type=float, default=0.2, help='Probabilité de balise par mot')
+    e2e.add_argument('--repetition', type=float, default=0.2, help='Proportion de répliques répétées')
+    e2e.add_argument('--latency', type=float, default=0.02, help='Latence simulée par requête (s)')
+    e2e.add_argument('--jitter', type=float, default=0.0, help='Variation aléatoire de latence (s)')
+    e2e.add_argument('--error-rate', type=float, default=0.0, help='Proportion de réponses HTTP 500')
+    e2e.add_argument('--server-rps', type=float, default=None,
+                     help='Débit max accepté par le serveur avant de répondre 429')
+    e2e.add_argument('--max-workers', type=int, default=3)
+    e2e.add_argument('--batch-size', type=int, default=50)
+    e2e.add_argument('--two-phase', action='store_true')
+    e2e.add_argument('--async', dest='use_async', action='store_true')
+    e2e.add_argument('--concurrency', type=int, default=16)
+    e2e.add_argument('--rate-limit', type=float, default=None)
+    e2e.add_argument('--max-retries', type=int, default=5)
+    e2e.add_argument('--keep', action='store_true', help='Conserve les fichiers générés')
+    e2e.set_defaults(func=bench_e2e)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Tests du regroupement des textes (pack_texts / unpack_texts) et de la réutilisation des
+traductions de textes quasi identiques (split_affixes / adapt_translation) : ces fonctions
+décident quelle traduction est écrite sur quelle ligne.
+
+Lancement depuis la racine du dépôt : python -m unittest discover tests (ou python -m pytest)
+"""
+import unittest
+
+from AutoRenpyTranslator import (adapt_translation, pack_texts, similarity_group, split_affixes,
+                                 unpack_texts)
+
+
+class PackTextsTest(unittest.TestCase):
+    TEXTS = ["Hello!", "RENPYTAG0END  see you  RENPYTAG1END", "Déjà vu…", "What?"]
+
+    def test_round_trip(self):
+        self.assertEqual(unpack_texts(pack_texts(self.TEXTS), len(self.TEXTS)), self.TEXTS)
+
+    def test_single_text(self):
+        self.assertEqual(unpack_texts(pack_texts(["Hi"]), 1), ["Hi"])
+
+    def test_markers_rewritten_by_service(self):
+        # Le service peut changer la casse et les espaces autour des marqueurs, ou joindre les lignes
+        translated = "renpyseg0end Bonjour ! RENPYSEG1END   À bientôt\n\nRenpySeg2End Quoi ?"
+        self.assertEqual(unpack_texts(translated, 3), ["Bonjour !", "À bientôt", "Quoi ?"])
+
+    def test_markers_out_of_order(self):
+        with self.assertRaisesRegex(ValueError, "désordre"):
+            unpack_texts("RENPYSEG1END Au revoir\nRENPYSEG0END Bonjour", 2)
+
+    def test_text_before_first_marker(self):
+        with self.assertRaisesRegex(ValueError, "avant le premier marqueur"):
+            unpack_texts("Voici : RENPYSEG0END Bonjour\nRENPYSEG1END Au revoir", 2)
+
+    def test_missing_marker(self):
+        with self.assertRaisesRegex(ValueError, "1 marqueurs pour 2 textes"):
+            unpack_texts("RENPYSEG0END Bonjour Au revoir", 2)
+
+    def test_extra_marker(self):
+        with self.assertRaisesRegex(ValueError, "3 marqueurs pour 2 textes"):
+            unpack_texts("RENPYSEG0END Bonjour\nRENPYSEG1END Au revoir\nRENPYSEG2END Merci", 2)
+
+    def test_empty_segment(self):
+        with self.assertRaisesRegex(ValueError, "texte vide"):
+            unpack_texts("RENPYSEG0END Bonjour\nRENPYSEG1END   \nRENPYSEG2END Merci", 3)
+
+
+class AffixTest(unittest.TestCase):
+    def test_split_affixes(self):
+        self.assertEqual(split_affixes("  ¿Qué pasa?  "), ("  ¿", "Qué pasa", "?  "))
+        self.assertEqual(split_affixes("Hello"), ("", "Hello", ""))
+        self.assertEqual(split_affixes("(Wait...)"), ("(", "Wait", "...)"))
+
+    def test_same_punctuation_class_reused(self):
+        # "!" et "!!" sont de même nature : la traduction est reprise avec la ponctuation du texte
+        self.assertEqual(adapt_translation("Hello!", "Bonjour !", "Hello!!"), "Bonjour !!")
+        self.assertEqual(adapt_translation("Wait...", "Attends...", "Wait…"), "Attends…")
+        self.assertEqual(adapt_translation("Hello", "Bonjour", " Hello "), "Bonjour")
+
+    def test_different_punctuation_class_refused(self):
+        self.assertIsNone(adapt_translation("Hello!", "Bonjour !", "Hello?"))
+        self.assertIsNone(adapt_translation("Hello", "Bonjour", "Hello?"))
+        self.assertIsNone(adapt_translation("¿Hello?", "Bonjour ?", "Hello?"))
+
+    def test_translation_ending_differs_from_source(self):
+        # Le service a changé la ponctuation de la source : impossible de savoir quoi remplacer
+        self.assertIsNone(adapt_translation("Hello!", "Bonjour.", "Hello!!"))
+        self.assertIsNone(adapt_translation("Hello", "Bonjour !", "Hello"))
+
+    def test_different_core_refused(self):
+        self.assertIsNone(adapt_translation("Hello!", "Bonjour !", "Hello you!"))
+        self.assertIsNone(adapt_translation("Hello!", "!", "Hello!!"))
+
+    def test_similarity_group(self):
+        self.assertEqual(similarity_group("Hello!"), similarity_group("Hello!!"))
+        self.assertEqual(similarity_group("Hello  world."), similarity_group("Hello world..."))
+        self.assertNotEqual(similarity_group("Hello!"), similarity_group("Hello?"))
+        self.assertIsNone(similarity_group("..."))
+
+
+if __name__ == '__main__':
+    unittest.main()